@@ -0,0 +1,76 @@
+""" Benchmark: the position table built by MyWindow.on_graph_clicked, with
+one DoubleKeyTable lookup per mountain per group versus set_many / get_many.
+
+MountainOrganiser.cur_position is a linear scan, which would dominate at
+this size, so ranks are precomputed and only the table work is timed.
+
+Usage:
+    python -m benchmarks.bench_graph_positions [-n 10000] [-d 10]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from double_key_table import DoubleKeyTable
+from mountain import Mountain
+
+
+def make_groups(n: int, difficulties: int, seed: int = 1008) -> list[list[Mountain]]:
+    rng = random.Random(seed)
+    mountains = [Mountain(f"mountain-{i}", rng.randint(1, difficulties), rng.randint(1, 10_000)) for i in range(n)]
+    mountains.sort(key=lambda mountain: mountain.difficulty_level)
+    groups = []
+    for mountain in mountains:
+        if not groups or groups[-1][0].difficulty_level != mountain.difficulty_level:
+            groups.append([])
+        groups[-1].append(mountain)
+    return groups
+
+
+def one_by_one(groups: list[list[Mountain]], rank: dict[str, int]) -> list:
+    # As on_graph_clicked was written.
+    positions = DoubleKeyTable()
+    all_mountains = []
+    for group in groups:
+        for mountain in group:
+            positions[mountain.difficulty_level, mountain.name] = []
+        all_mountains.extend(group)
+        for mountain in all_mountains:
+            positions[mountain.difficulty_level, mountain.name].append(rank[mountain.name])
+    return [positions[mountain.difficulty_level, mountain.name] for mountain in all_mountains]
+
+
+def batched(groups: list[list[Mountain]], rank: dict[str, int]) -> list:
+    positions = DoubleKeyTable()
+    all_mountains, all_keys = [], []
+    for group in groups:
+        positions.set_many(((mountain.difficulty_level, mountain.name), []) for mountain in group)
+        all_mountains.extend(group)
+        all_keys.extend((mountain.difficulty_level, mountain.name) for mountain in group)
+        for mountain, trail in zip(all_mountains, positions.get_many(all_keys)):
+            trail.append(rank[mountain.name])
+    return positions.get_many(all_keys)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=10_000, help="Number of mountains.")
+    parser.add_argument("-d", type=int, default=10, help="Number of difficulty levels.")
+    args = parser.parse_args()
+
+    groups = make_groups(args.n, args.d)
+    ranked = sorted((mountain for group in groups for mountain in group), key=lambda m: (m.length, m.name))
+    rank = {mountain.name: i for i, mountain in enumerate(ranked)}
+
+    results = []
+    for name, build in [("one by one", one_by_one), ("set/get_many", batched)]:
+        start = time.perf_counter()
+        results.append(build(groups, rank))
+        print(f"n={args.n:>7,}  groups={len(groups):>3}  {name:13} {time.perf_counter() - start:7.3f}s")
+    assert results[0] == results[1]
+
+
+if __name__ == "__main__":
+    main()
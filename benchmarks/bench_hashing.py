@@ -0,0 +1,69 @@
+""" Micro-benchmark: LinearProbeTable insert/lookup throughput with the
+original per-table-size string hash versus the memoized fingerprint hash.
+
+Usage:
+    python -m benchmarks.bench_hashing [-n 1000000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import time
+
+from data_structures.hash_table import LinearProbeTable
+from data_structures.hashing import fingerprint
+
+
+class LegacyHashTable(LinearProbeTable):
+    """ LinearProbeTable using the original hash, which walks the key on every call. """
+
+    def hash(self, key: str) -> int:
+        value = 0
+        a = 31415
+        for char in key:
+            value = (ord(char) + a * value) % self.table_size
+            a = a * self.HASH_BASE % (self.table_size - 1)
+        return value
+
+
+def make_keys(n: int, seed: int = 1008) -> list[str]:
+    rng = random.Random(seed)
+    letters = string.ascii_lowercase
+    return [
+        "".join(rng.choice(letters) for _ in range(rng.randint(12, 24))) + str(i)
+        for i in range(n)
+    ]
+
+
+def run(table_type: type, keys: list[str]) -> tuple[float, float]:
+    table = table_type()
+    start = time.perf_counter()
+    for i, key in enumerate(keys):
+        table[key] = i
+    insert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in keys:
+        table[key]
+    lookup_time = time.perf_counter() - start
+    return insert_time, lookup_time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=1_000_000, help="Number of string keys.")
+    args = parser.parse_args()
+
+    keys = make_keys(args.n)
+    for name, table_type in [("before (legacy hash)", LegacyHashTable), ("after (fingerprint)", LinearProbeTable)]:
+        fingerprint.cache_clear()
+        insert_time, lookup_time = run(table_type, keys)
+        print(
+            f"{name:22} insert: {args.n / insert_time:12,.0f} ops/s ({insert_time:.2f}s)   "
+            f"lookup: {args.n / lookup_time:12,.0f} ops/s ({lookup_time:.2f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
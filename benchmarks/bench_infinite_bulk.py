@@ -0,0 +1,48 @@
+""" Benchmark: building an InfiniteHashTable of realistic mountain names one
+key at a time versus with InfiniteHashTable.from_sorted.
+
+Names are generated and sorted before timing, since the bulk build needs
+them in key order.
+
+Usage:
+    python -m benchmarks.bench_infinite_bulk [-n 100000] [-r 3]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from benchmarks.bench_infinite_table import make_names
+from infinite_hash_table import InfiniteHashTable
+
+
+def build_by_insert(items: list[tuple[str, int]]) -> InfiniteHashTable:
+    table = InfiniteHashTable()
+    for name, value in items:
+        table[name] = value
+    return table
+
+
+def best_time(build, items: list[tuple[str, int]], repeat: int) -> float:
+    """ Returns the fastest of repeat builds, in seconds. """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build(items)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=100_000, help="Number of names.")
+    parser.add_argument("-r", type=int, default=3, help="Repetitions per measurement (best is reported).")
+    args = parser.parse_args()
+
+    items = sorted((name, i) for i, name in enumerate(make_names(args.n)))
+    for label, build in [("insert", build_by_insert), ("from_sorted", InfiniteHashTable.from_sorted)]:
+        print(f"n={args.n:>9,}  {label:12} {best_time(build, items, args.r):6.3f}s")
+
+
+if __name__ == "__main__":
+    main()
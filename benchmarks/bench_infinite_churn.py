@@ -0,0 +1,62 @@
+""" Micro-benchmark: InfiniteHashTable under insert/delete churn, with and
+without the pool of reusable DenseNodes.
+
+Each round inserts a batch of keys sharing a short prefix, so their tables
+grow into DenseNodes, then deletes them again so the DenseNodes are dropped.
+
+Usage:
+    python -m benchmarks.bench_infinite_churn [-r 20000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import time
+
+from infinite_hash_table import InfiniteHashTable
+
+
+class UnpooledInfiniteHashTable(InfiniteHashTable):
+    POOL_SIZE = 0
+
+
+def make_batches(rounds: int, seed: int = 1008) -> list[list[str]]:
+    rng = random.Random(seed)
+    letters = string.ascii_lowercase
+    return [
+        [prefix + letter + rng.choice(letters) for letter in letters[:12]]
+        for prefix in ("".join(rng.choice(letters) for _ in range(3)) for _ in range(rounds))
+    ]
+
+
+def run(table_type: type, base: list[str], batches: list[list[str]]) -> float:
+    """ Returns seconds for every round of churn, on a table already holding base. """
+    table = table_type()
+    for key in base:
+        table[key] = 0
+    start = time.perf_counter()
+    for batch in batches:
+        for key in batch:
+            table[key] = 1
+        for key in batch:
+            if key in table:
+                del table[key]
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-r", type=int, default=20_000, help="Number of insert/delete rounds.")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    base = list({"".join(rng.choice(string.ascii_lowercase) for _ in range(8)) for _ in range(50_000)})
+    batches = make_batches(args.r)
+    for name, table_type in [("no pool", UnpooledInfiniteHashTable), ("pool", InfiniteHashTable)]:
+        elapsed = run(table_type, base, batches)
+        print(f"rounds={args.r:>7,}  {name:8} {elapsed:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
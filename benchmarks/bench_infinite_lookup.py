@@ -0,0 +1,97 @@
+""" Micro-benchmark: InfiniteHashTable __getitem__ and `in` throughput, looking
+keys up through the list of (node, index) pairs on their path (raising
+KeyError on a miss) versus the iterative lookup.
+
+Usage:
+    python -m benchmarks.bench_infinite_lookup [-n 1000000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import time
+
+from infinite_hash_table import InfiniteHashTable
+
+
+class PathLookupTable(InfiniteHashTable):
+    """ Lookups as first written: build the path, then read the last slot of it. """
+
+    def _path(self, key: str) -> list:
+        path = []
+        node = self.root
+        while True:
+            if self._skip_mismatch(key, node) is not None:
+                raise KeyError(key)
+            index = self.hash(key, node.level)
+            path.append((node, index))
+            child = node.child(index)
+            if child is None:
+                raise KeyError(key)
+            if isinstance(child, tuple):
+                if child[0] != key:
+                    raise KeyError(key)
+                return path
+            node = child
+
+    def __getitem__(self, key: str):
+        node, index = self._path(key)[-1]
+        return node.child(index)[1]
+
+    def __contains__(self, key: str) -> bool:
+        try:
+            _ = self[key]
+        except KeyError:
+            return False
+        else:
+            return True
+
+
+def make_keys(n: int, seed: int = 1008) -> list[str]:
+    # Lowercase letters only: they are all distinct modulo 26, so no two
+    # keys share a location at every level.
+    rng = random.Random(seed)
+    keys = set()
+    while len(keys) < n:
+        keys.add("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(6, 16))))
+    return list(keys)
+
+
+def run(table_type: type, keys: list[str], misses: list[str]) -> tuple[float, float, float]:
+    """ Returns seconds for __getitem__ on every key, `in` on every key, and `in` on misses. """
+    table = table_type()
+    for i, key in enumerate(keys):
+        table[key] = i
+    start = time.perf_counter()
+    for key in keys:
+        table[key]
+    get_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for key in keys:
+        key in table
+    hit_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for key in misses:
+        key in table
+    miss_time = time.perf_counter() - start
+    return get_time, hit_time, miss_time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=1_000_000, help="Number of keys.")
+    args = parser.parse_args()
+
+    keys = make_keys(2 * args.n)
+    keys, misses = keys[:args.n], keys[args.n:]
+    for name, table_type in [("path + KeyError", PathLookupTable), ("iterative", InfiniteHashTable)]:
+        get_time, hit_time, miss_time = run(table_type, keys, misses)
+        print(
+            f"n={args.n:>9,}  {name:16} getitem: {args.n / get_time / 1e6:5.2f} M/s  "
+            f"in (hit): {args.n / hit_time / 1e6:5.2f} M/s  in (miss): {args.n / miss_time / 1e6:5.2f} M/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+""" Memory benchmark: InfiniteHashTable with a full 27-slot ArrayR per table
+(as originally designed) versus adaptive, path-compressed nodes, on realistic
+mountain names, measured with tracemalloc.
+
+Names are built before measuring, so only the tables' own allocations are counted.
+
+Usage:
+    python -m benchmarks.bench_infinite_table [-n 100000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from data_structures.referential_array import ArrayR
+from infinite_hash_table import InfiniteHashTable
+
+PREFIXES = ["Mount", "Mt", "Ben", "Pic", "Cerro", "Monte", "Piz", "Sgurr", "Nevado", "Pico", "Lake", "Glen"]
+SYLLABLES = ["ka", "ra", "lin", "mor", "dun", "el", "bra", "ste", "ro", "na", "vik", "tor", "gan", "ash",
+             "wel", "ber", "hal", "im", "o", "sa", "thi", "ul", "zen", "que", "ford", "ridge", "peak"]
+
+
+class LegacyInfiniteHashTable(InfiniteHashTable):
+    """ One 27-slot ArrayR per table, created level by level until two keys separate. """
+
+    def __init__(self) -> None:
+        self.root = ArrayR(self.TABLE_SIZE)
+        self.count = 0
+
+    def __setitem__(self, key: str, value) -> None:
+        table, level = self.root, 0
+        while True:
+            index = self.hash(key, level)
+            child = table[index]
+            if child is None or (isinstance(child, tuple) and child[0] == key):
+                self.count += child is None
+                table[index] = (key, value)
+                return
+            if isinstance(child, tuple):
+                new_table = ArrayR(self.TABLE_SIZE)
+                new_table[self.hash(child[0], level + 1)] = child
+                table[index] = new_table
+                child = new_table
+            table, level = child, level + 1
+
+
+def make_names(n: int, seed: int = 1008) -> list[str]:
+    """ n distinct mountain names, with no two sharing a location at every level. """
+    rng = random.Random(seed)
+    names, seen = [], set()
+    while len(names) < n:
+        words = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))).capitalize()
+                 for _ in range(rng.randint(1, 2))]
+        name = " ".join([rng.choice(PREFIXES)] + words)
+        signature = tuple(ord(char) % 26 for char in name)
+        if signature not in seen:
+            seen.add(signature)
+            names.append(name)
+    return names
+
+
+def measure(table_type: type, names: list[str]) -> tuple[int, float]:
+    """ Returns (retained bytes, seconds) to build a table over names. """
+    tracemalloc.start()
+    start = time.perf_counter()
+    table = table_type()
+    for i, name in enumerate(names):
+        table[name] = i
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del table
+    return current, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=100_000, help="Number of names.")
+    args = parser.parse_args()
+
+    names = make_names(args.n)
+    for name, table_type in [("27-slot tables", LegacyInfiniteHashTable), ("adaptive nodes", InfiniteHashTable)]:
+        current, elapsed = measure(table_type, names)
+        print(
+            f"n={args.n:>9,}  {name:15} retained: {current / 2**20:8.1f} MiB "
+            f"({current / args.n:7.1f} B/key)  build: {elapsed:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+""" Memory benchmark: DoubleKeyTable with a hashed LinearProbeTable per top-level
+key (inline_threshold=0) versus small groups kept inline in a SmallTable,
+measured with tracemalloc.
+
+Each top-level key holds between 1 and 3 entries. Keys are built and
+fingerprinted before measuring, so only the tables' own allocations are counted.
+
+Usage:
+    python -m benchmarks.bench_inner_tables [-n 100000]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+
+from double_key_table import DoubleKeyTable
+from data_structures.hashing import hash_key
+
+
+def measure(inline_threshold: int | None, pairs: list[tuple[str, str]]) -> tuple[int, int, float]:
+    """ Returns (retained bytes, peak bytes, seconds) to build a table over pairs. """
+    tracemalloc.start()
+    start = time.perf_counter()
+    table = DoubleKeyTable(inline_threshold=inline_threshold)
+    for i, key in enumerate(pairs):
+        table[key] = i
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del table
+    return current, peak, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=100_000, help="Number of top-level keys.")
+    args = parser.parse_args()
+
+    pairs = [(f"mountain-{i}", f"peak-{j}") for i in range(args.n) for j in range(i % 3 + 1)]
+    # Warm the fingerprint cache so it is not counted against either layout.
+    for key1, key2 in pairs:
+        hash_key(key1)
+        hash_key(key2)
+
+    for name, threshold in [("hashed groups", 0), ("inline groups", None)]:
+        current, peak, elapsed = measure(threshold, pairs)
+        print(
+            f"n={args.n:>9,}  {name:14} retained: {current / 2**20:8.1f} MiB "
+            f"({current / args.n:7.1f} B/key)  peak: {peak / 2**20:8.1f} MiB  build: {elapsed:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
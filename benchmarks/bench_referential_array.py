@@ -0,0 +1,67 @@
+""" Benchmark: ArrayR allocation and full-scan time at each size in TABLE_SIZES,
+original implementation versus the current one.
+
+Usage:
+    python -m benchmarks.bench_referential_array [-r 5]
+"""
+from __future__ import annotations
+
+import argparse
+import timeit
+from ctypes import py_object
+
+from data_structures.hash_table import LinearProbeTable
+from data_structures.referential_array import ArrayR
+
+
+class LegacyArrayR(ArrayR):
+    """ ArrayR as originally written: None-initialised one slot at a time,
+    and iterated through __getitem__. """
+
+    def __init__(self, length: int) -> None:
+        if length <= 0:
+            raise ValueError("Array length should be larger than 0.")
+        self.array = (length * py_object)()
+        self.array[:] = [None for _ in range(length)]
+
+    __iter__ = None
+
+
+def scan_by_index(array: ArrayR) -> int:
+    # What every `for item in array` loop did before ArrayR had __iter__.
+    count = 0
+    for x in range(len(array)):
+        if array[x] is not None:
+            count += 1
+    return count
+
+
+def scan_by_iter(array: ArrayR) -> int:
+    count = 0
+    for item in array:
+        if item is not None:
+            count += 1
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-r", type=int, default=5, help="Repetitions per measurement (best is reported).")
+    args = parser.parse_args()
+
+    print(f"{'size':>9}  {'alloc before':>12}  {'alloc after':>12}  {'scan before':>12}  {'scan after':>12}")
+    for size in LinearProbeTable.TABLE_SIZES:
+        number = max(1, 200_000 // size)
+        alloc_before = min(timeit.repeat(lambda: LegacyArrayR(size), number=number, repeat=args.r)) / number
+        alloc_after = min(timeit.repeat(lambda: ArrayR(size), number=number, repeat=args.r)) / number
+        legacy, array = LegacyArrayR(size), ArrayR(size)
+        scan_before = min(timeit.repeat(lambda: scan_by_index(legacy), number=number, repeat=args.r)) / number
+        scan_after = min(timeit.repeat(lambda: scan_by_iter(array), number=number, repeat=args.r)) / number
+        print(
+            f"{size:>9}  {alloc_before * 1e3:10.3f}ms  {alloc_after * 1e3:10.3f}ms  "
+            f"{scan_before * 1e3:10.3f}ms  {scan_after * 1e3:10.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+""" Memory benchmark: LinearProbeTable (array of (key, value) tuples) versus
+SplitLinearProbeTable (parallel key / value / home arrays), measured with tracemalloc.
+
+Keys and values are built before measuring, so only the table's own allocations are counted.
+
+Usage:
+    python -m benchmarks.bench_storage_layout [-n 100000 1000000]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+
+from data_structures.hash_table import LinearProbeTable
+from data_structures.split_hash_table import SplitLinearProbeTable
+from data_structures.hashing import fingerprint
+
+
+def measure(table_type: type, keys: list[str], values: list[int]) -> tuple[int, int, float]:
+    """ Returns (retained bytes, peak bytes, seconds) to build a table mapping keys to values. """
+    # Warm the fingerprint cache so it is not counted against either layout.
+    for key in keys:
+        fingerprint(key)
+    tracemalloc.start()
+    start = time.perf_counter()
+    table = table_type()
+    for key, value in zip(keys, values):
+        table[key] = value
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del table
+    return current, peak, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, nargs="+", default=[100_000, 1_000_000], help="Numbers of entries.")
+    args = parser.parse_args()
+
+    for n in args.n:
+        keys = [f"mountain-{i}" for i in range(n)]
+        values = list(range(n))
+        for name, table_type in [("tuple layout", LinearProbeTable), ("split layout", SplitLinearProbeTable)]:
+            current, peak, elapsed = measure(table_type, keys, values)
+            print(
+                f"n={n:>9,}  {name:13} retained: {current / 2**20:8.1f} MiB "
+                f"({current / n:6.1f} B/entry)  peak: {peak / 2**20:8.1f} MiB  build: {elapsed:.2f}s"
+            )
+        fingerprint.cache_clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Generic, Iterable, Iterator
+
+from double_key_table import DoubleKeyTable, DoubleKeyTableSnapshot, K1, K2, V
+from data_structures.hashing import hash_key
+
+
+class ConcurrentDoubleKeyTable(Generic[K1, K2, V]):
+    """
+    Thread-safe Double Key Table.
+
+    Wraps a DoubleKeyTable behind striped locks. Each top-level key maps to
+    one of `stripes` locks, so operations on existing top-level keys in
+    different stripes run in parallel. Anything that changes the top-level
+    table itself (adding or removing a top-level key, and so any resize of
+    it) takes every lock, as does reading the whole table, so readers never
+    see a half-moved table and iteration works on a consistent snapshot.
+
+    Stripes are chosen by hash_key(key1) rather than by top-level slot, so
+    a key keeps its lock when the top-level table is resized.
+
+    Type Arguments:
+        - K1:   1st Key Type, a string or int (or a tuple of those).
+        - K2:   2nd Key Type.
+        - V:    Value Type.
+    """
+
+    # Default number of locks.
+    STRIPES = 16
+
+    def __init__(self, stripes: int = STRIPES, **kwargs) -> None:
+        """
+        Initialise the table.
+
+        :param stripes: number of locks top-level keys are spread over.
+        :param kwargs: passed on to DoubleKeyTable.
+        :raises ValueError: when stripes is less than 1.
+        """
+        if stripes < 1:
+            raise ValueError(f"Need at least one stripe, got {stripes}.")
+        self.table: DoubleKeyTable[K1, K2, V] = DoubleKeyTable(**kwargs)
+        self.locks = [threading.Lock() for _ in range(stripes)]
+
+    def _lock_for(self, key1: K1) -> threading.Lock:
+        """
+        Returns the lock guarding key1.
+
+        :complexity: O(hash_key(key1))
+        """
+        return self.locks[hash_key(key1) % len(self.locks)]
+
+    @contextmanager
+    def _all_locks(self) -> Iterator[None]:
+        """
+        Holds every lock, always taken in the same order so writers cannot deadlock.
+
+        :complexity: O(stripes)
+        """
+        for lock in self.locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(self.locks):
+                lock.release()
+
+    def _shares_structure(self) -> bool:
+        """
+        Whether every write touches state shared by all top-level keys.
+        The reverse index is keyed by key2, so it is not covered by one stripe.
+        """
+        return self.table.reverse is not None
+
+    def __getitem__(self, key: tuple[K1, K2]) -> V:
+        """
+        Get the value at a certain key
+
+        :raises KeyError: when the key doesn't exist.
+        """
+        with self._lock_for(key[0]):
+            return self.table[key]
+
+    def __contains__(self, key: tuple[K1, K2]) -> bool:
+        """
+        Checks to see if the given key is in the table
+        """
+        with self._lock_for(key[0]):
+            return key in self.table
+
+    def __setitem__(self, key: tuple[K1, K2], data: V) -> None:
+        """
+        Set an (key, value) pair in the table.
+
+        Only the key's stripe is locked when key[0] is already in the table.
+        A new top-level key takes every lock.
+        """
+        if not self._shares_structure():
+            with self._lock_for(key[0]):
+                if self.table._sub_table_or_none(key[0]) is not None:
+                    self.table[key] = data
+                    return
+        with self._all_locks():
+            self.table[key] = data
+
+    def __delitem__(self, key: tuple[K1, K2]) -> None:
+        """
+        Deletes a (key, value) pair from the table.
+
+        Only the key's stripe is locked while key[0] keeps other entries.
+        Removing the last entry of a top-level key takes every lock.
+
+        :raises KeyError: when the key doesn't exist.
+        """
+        if not self._shares_structure():
+            with self._lock_for(key[0]):
+                if len(self.table.sub_table(key[0])) > 1:
+                    del self.table[key]
+                    return
+        with self._all_locks():
+            del self.table[key]
+
+    def set_many(self, items: Iterable[tuple[tuple[K1, K2], V]]) -> None:
+        """
+        Set every ((key1, key2), value) pair, in order, see DoubleKeyTable.set_many.
+        Takes every lock, since the pairs can span stripes and add top-level keys.
+        """
+        items = list(items)
+        with self._all_locks():
+            self.table.set_many(items)
+
+    def get_many(self, keys: Iterable[tuple[K1, K2]]) -> list[V]:
+        """
+        Get the value for every (key1, key2) pair, in order, see DoubleKeyTable.get_many.
+
+        :raises KeyError: when a key doesn't exist.
+        """
+        keys = list(keys)
+        with self._all_locks():
+            return self.table.get_many(keys)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of top-level keys.
+        """
+        return len(self.table)
+
+    def keys(self, key: K1 | None = None) -> list[K1 | K2]:
+        """
+        Snapshot of the top-level keys, or of the bottom-level keys for key.
+        See DoubleKeyTable.keys.
+        """
+        with self._all_locks():
+            return self.table.keys(key)
+
+    def values(self, key: K1 | None = None) -> list[V]:
+        """
+        Snapshot of the values, or of the values for key. See DoubleKeyTable.values.
+        """
+        with self._all_locks():
+            return self.table.values(key)
+
+    def keys_for_second(self, key: K2) -> list[K1]:
+        """
+        Snapshot of the top-level keys that have key as a bottom-level key.
+        See DoubleKeyTable.keys_for_second.
+
+        :raises ValueError: if the table was created without reverse_index.
+        """
+        with self._all_locks():
+            return self.table.keys_for_second(key)
+
+    def values_for_second(self, key: K2) -> list[V]:
+        """
+        Snapshot of the values of every (k1, key) entry.
+        See DoubleKeyTable.values_for_second.
+
+        :raises ValueError: if the table was created without reverse_index.
+        """
+        with self._all_locks():
+            return self.table.values_for_second(key)
+
+    def items(self) -> list[tuple[tuple[K1, K2], V]]:
+        """
+        Snapshot of every ((key1, key2), value) entry.
+        """
+        with self._all_locks():
+            return list(self.table.iter_items())
+
+    def snapshot(self) -> DoubleKeyTableSnapshot[K1, K2, V]:
+        """
+        Read-only view of the table as it is now, see DoubleKeyTable.snapshot.
+        The view does not need locking.
+        """
+        with self._all_locks():
+            return self.table.snapshot()
+
+    def compact(self) -> None:
+        """
+        See DoubleKeyTable.compact.
+        """
+        with self._all_locks():
+            self.table.compact()
+
+    def stats(self) -> dict:
+        """
+        See DoubleKeyTable.stats.
+        """
+        with self._all_locks():
+            return self.table.stats()
@@ -0,0 +1,193 @@
+""" Array List ADT
+
+Defines a growable array of references, backed by an ArrayR. The
+capacity doubles when the list fills up and halves when it falls to a
+quarter full, so appends and pops from the end cost amortised O(1).
+"""
+from __future__ import annotations
+__docformat__ = 'reStructuredText'
+
+from itertools import repeat
+from operator import is_
+from typing import TypeVar, Generic, Iterable, Iterator
+from data_structures.referential_array import ArrayR
+
+T = TypeVar('T')
+
+
+class ArrayList(Generic[T]):
+    """ Implementation of a list with a resizable array.
+
+        Attributes:
+            length (int): number of elements in the list
+            array (ArrayR[T]): backing array, only the first `length` slots are used
+            reserved (int): capacity kept by reserve, the list never shrinks below it
+    """
+
+    MIN_CAPACITY = 4
+
+    def __init__(self, items: Iterable[T] = (), capacity: int = MIN_CAPACITY) -> None:
+        """ Object initializer.
+        :complexity: O(capacity + len(items))
+        """
+        self.length = 0
+        self.reserved = 0
+        self.array: ArrayR[T] = ArrayR(max(self.MIN_CAPACITY, capacity))
+        for item in items:
+            self.append(item)
+
+    def __len__(self) -> int:
+        """ Returns the number of elements in the list. """
+        return self.length
+
+    def is_empty(self) -> bool:
+        """ Returns True iff the list is empty. """
+        return self.length == 0
+
+    @property
+    def capacity(self) -> int:
+        """ Number of elements the list can hold before it has to grow. """
+        return len(self.array)
+
+    def _check_index(self, index: int) -> int:
+        """ Converts a (possibly negative) index into a position in the array.
+        :raises IndexError: if the index is out of range.
+        """
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("List index out of range.")
+        return index
+
+    def __getitem__(self, index: int) -> T:
+        """ Returns the element at position index.
+        :complexity: O(1)
+        :raises IndexError: if the index is out of range.
+        """
+        return self.array[self._check_index(index)]
+
+    def __setitem__(self, index: int, value: T) -> None:
+        """ Sets the element at position index to value.
+        :complexity: O(1)
+        :raises IndexError: if the index is out of range.
+        """
+        index = self._check_index(index)
+        if value is None:
+            self.array.release(index)
+        else:
+            self.array[index] = value
+
+    def __iter__(self) -> Iterator[T]:
+        """ Iterates over the elements of the list.
+        :complexity: O(length)
+        """
+        for index in range(self.length):
+            yield self.array[index]
+
+    def _move(self, start: int, stop: int, to: int) -> None:
+        """ Moves the elements in positions [start, stop) to start at position to.
+        A slot that gets None from the move lets go of what it held (see
+        ArrayR.release), so elements that leave the list are not kept alive.
+        :complexity: O(stop - start), in C unless some of the elements are None.
+        """
+        items = self.array[start:stop]
+        self.array[to:to + len(items)] = items
+        if any(map(is_, items, repeat(None))):
+            for offset, item in enumerate(items):
+                if item is None:
+                    self.array.release(to + offset)
+
+    def _resize(self, capacity: int) -> None:
+        """ Moves the elements into a new backing array of the given capacity.
+        The old array is dropped, so it holds nothing that has left the list.
+        :complexity: O(capacity)
+        """
+        new_array = ArrayR(max(self.MIN_CAPACITY, capacity))
+        new_array.copy_from(self.array, 0, self.length)
+        self.array = new_array
+
+    def reserve(self, capacity: int) -> None:
+        """ Makes sure at least capacity elements fit without growing again,
+        and keeps that room when elements are removed.
+        :complexity: O(capacity) if the list has to grow, O(1) otherwise.
+        """
+        self.reserved = max(self.reserved, capacity)
+        if capacity > self.capacity:
+            self._resize(capacity)
+
+    def _shrink_if_sparse(self) -> None:
+        """ Halves the capacity once the list is at most a quarter full,
+        but not below the reserved capacity.
+        """
+        floor = max(self.MIN_CAPACITY, self.reserved)
+        if self.capacity > floor and self.length <= self.capacity // 4:
+            self._resize(max(floor, self.capacity // 2))
+
+    def append(self, item: T) -> None:
+        """ Adds item to the end of the list.
+        :complexity: amortised O(1), O(length) when the list has to grow.
+        """
+        if self.length == self.capacity:
+            self._resize(2 * self.capacity)
+        self.array[self.length] = item
+        self.length += 1
+
+    def insert(self, index: int, item: T) -> None:
+        """ Inserts item before position index, shifting the rest of the list up.
+        An index past the end appends.
+        :complexity: O(length - index) plus amortised O(1) for growing.
+        """
+        if index < 0:
+            index = max(0, index + self.length)
+        index = min(index, self.length)
+        if self.length == self.capacity:
+            self._resize(2 * self.capacity)
+        self._move(index, self.length, index + 1)
+        if item is None:
+            self.array.release(index)
+        else:
+            self.array[index] = item
+        self.length += 1
+
+    def pop(self, index: int = -1) -> T:
+        """ Removes and returns the element at position index (the last one by default).
+        :complexity: O(length - index) plus amortised O(1) for shrinking.
+        :raises IndexError: if the index is out of range.
+        """
+        index = self._check_index(index)
+        item = self.array[index]
+        self._move(index + 1, self.length, index)
+        self.length -= 1
+        self.array.release(self.length)
+        self._shrink_if_sparse()
+        return item
+
+    def index(self, item: T) -> int:
+        """ Returns the position of the first element equal to item.
+        :complexity: O(length)
+        :raises ValueError: if item is not in the list.
+        """
+        for index in range(self.length):
+            if self.array[index] == item:
+                return index
+        raise ValueError("Item not in list.")
+
+    def remove(self, item: T) -> None:
+        """ Removes the first element equal to item.
+        :complexity: O(length)
+        :raises ValueError: if item is not in the list.
+        """
+        self.pop(self.index(item))
+
+    def clear(self) -> None:
+        """ Removes every element and releases the backing array, dropping
+        any reserved capacity.
+        :complexity: O(MIN_CAPACITY)
+        """
+        self.length = 0
+        self.reserved = 0
+        self.array = ArrayR(self.MIN_CAPACITY)
+
+    def __str__(self) -> str:
+        """ Returns the elements of the list, in order. """
+        return "[" + ", ".join(str(item) for item in self) + "]"
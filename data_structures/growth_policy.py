@@ -0,0 +1,101 @@
+""" Growth policy for the hash table ADTs.
+
+Decides when a hash table is too full and which size it grows to next,
+so the trade-off between memory and probe length can be tuned per table.
+"""
+from __future__ import annotations
+__docformat__ = 'reStructuredText'
+
+
+def is_prime(n: int) -> bool:
+    """
+    Trial division primality test.
+
+    :complexity: O(sqrt(n))
+    """
+    if n < 2:
+        return False
+    if n % 2 == 0:
+        return n == 2
+    factor = 3
+    while factor * factor <= n:
+        if n % factor == 0:
+            return False
+        factor += 2
+    return True
+
+
+def next_prime(n: int) -> int:
+    """
+    Smallest prime greater than or equal to n.
+
+    :complexity: O(g*sqrt(n)) where g is the gap to the next prime.
+    """
+    while not is_prime(n):
+        n += 1
+    return n
+
+
+class GrowthPolicy:
+    """
+    Growth policy shared by LinearProbeTable and DoubleKeyTable.
+
+    Attributes:
+        max_load_factor (float): the table grows once it is more than this full.
+                                 Below 1, so a table grows at the latest when
+                                 an insert fills its last slot.
+        growth_factor (float): how much bigger each generated size is than the last.
+        extend (bool): whether to keep generating prime sizes once the
+                       table's own size list runs out. Otherwise the table
+                       stops growing at the last size.
+    """
+
+    def __init__(self, max_load_factor: float = 0.5, growth_factor: float = 2, extend: bool = True) -> None:
+        """ Object initializer. """
+        if not 0 < max_load_factor < 1:
+            raise ValueError("Load factor should be in (0, 1).")
+        if growth_factor <= 1:
+            raise ValueError("Growth factor should be larger than 1.")
+        self.max_load_factor = max_load_factor
+        self.growth_factor = growth_factor
+        self.extend = extend
+        self._next_sizes = {}
+
+    def should_grow(self, count: int, table_size: int) -> bool:
+        """
+        Whether a table of table_size holding count items is over the load factor.
+        """
+        return count > table_size * self.max_load_factor
+
+    def fits(self, count: int, table_size: int) -> bool:
+        """
+        Whether a table of table_size can hold count items without growing.
+        """
+        return count <= table_size * self.max_load_factor
+
+    def size_after(self, size: int) -> int:
+        """
+        The generated size following size: the first prime at least growth_factor times bigger.
+
+        :complexity: O(1) once computed, see next_prime otherwise.
+        """
+        if size not in self._next_sizes:
+            self._next_sizes[size] = next_prime(int(size * self.growth_factor) + 1)
+        return self._next_sizes[size]
+
+    def size_at(self, sizes: list[int], index: int) -> int | None:
+        """
+        The table size at position index of the growth sequence: taken from sizes,
+        then generated past its end if extend is set.
+
+        :return: the size, or None if the table cannot grow that far.
+        :complexity: O(index - len(sizes)) past the end of sizes, O(1) otherwise.
+        """
+        if index < len(sizes):
+            return sizes[index]
+        if not self.extend:
+            return None
+        size = sizes[-1]
+        for _ in range(index - len(sizes) + 1):
+            size = self.size_after(size)
+        return size
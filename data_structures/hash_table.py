@@ -7,8 +7,12 @@ __author__ = 'Jackson Goerner'
 __since__ = '07/02/2023'
 
 
-from typing import TypeVar, Generic
+import copy
+import time
+from typing import TypeVar, Generic, Iterable, Iterator
 from data_structures.referential_array import ArrayR
+from data_structures.hashing import hash_key
+from data_structures.growth_policy import GrowthPolicy
 
 K = TypeVar('K')
 V = TypeVar('V')
@@ -17,13 +21,26 @@ class FullError(Exception):
     pass
 
 
+def stays_put(home: int, gap: int, position: int) -> bool:
+    """
+    Whether the item at position, whose home slot is home, has to stay where
+    it is when gap, an earlier slot of its cluster, is emptied by a
+    backward-shift delete. It does when its home is in (gap, position],
+    wrapping around the end of the table, since moving it to gap would put
+    it before its home.
+    """
+    if gap < position:
+        return gap < home <= position
+    return home > gap or home <= position
+
+
 class LinearProbeTable(Generic[K, V]):
     """
     Linear Probe Table.
 
     Type Arguments:
-        - K:    Key Type. In most cases should be string.
-                Otherwise `hash` should be overwritten.
+        - K:    Key Type. In most cases should be string or int
+                (or a tuple of those). Otherwise `hash` should be overwritten.
         - V:    Value Type.
 
     Unless stated otherwise, all methods have O(1) complexity.
@@ -34,29 +51,101 @@ class LinearProbeTable(Generic[K, V]):
 
     HASH_BASE = 31
 
-    def __init__(self, sizes=None) -> None:
+    # Load factor of the default growth policy.
+    MAX_LOAD_FACTOR = 0.5
+
+    # Resize history and operation counters, see stats(). Kept as class
+    # defaults so tables that never resize or count carry no extra state.
+    rehash_count = 0
+    rehash_time = 0.0
+    counters: dict | None = None
+
+    def __init__(self, sizes=None, shrink_threshold: float | None = None, policy: GrowthPolicy | None = None) -> None:
         """
         Initialise the Hash Table.
+
+        :param shrink_threshold: if given, deleting steps back down TABLE_SIZES
+                                 once the load factor falls below this value.
+        :param policy: when to grow and which sizes to grow to. By default the
+                       table grows past the end of TABLE_SIZES, but not past
+                       the end of explicitly given sizes.
         """
+        if policy is None:
+            policy = GrowthPolicy(self.MAX_LOAD_FACTOR, extend=sizes is None)
         if sizes is not None:
             self.TABLE_SIZES = sizes
+        self.policy = policy
+        self.shrink_threshold = shrink_threshold
         self.size_index = 0
         self.array:ArrayR[tuple[K, V]] = ArrayR(self.TABLE_SIZES[self.size_index])
+        # Home slot (initial hash position) of the item in each occupied slot.
+        self.homes:ArrayR[int] = ArrayR(self.table_size)
         self.count = 0
 
+    @classmethod
+    def from_items(cls, items: Iterable[tuple[K, V]], expected_size: int | None = None, sizes=None, policy: GrowthPolicy | None = None) -> LinearProbeTable[K, V]:
+        """
+        Build a table from (key, value) pairs in bulk.
+
+        The final table size is chosen up front from TABLE_SIZES, so loading
+        does not go through the rehash at every intermediate size.
+        If expected_size is not given, it is taken from len(items) when available.
+
+        :complexity: O(N*hash(K)) where N is the number of items, assuming
+                     expected_size is not an underestimate.
+        """
+        table = cls(sizes, policy=policy)
+        table.update(items, expected_size)
+        return table
+
+    def update(self, items: Iterable[tuple[K, V]], expected_size: int | None = None) -> None:
+        """
+        Insert all (key, value) pairs, resizing at most once up front.
+
+        :param expected_size: number of new items, defaults to len(items) when available.
+        :complexity: O(N*hash(K) + M) where N is the number of items and M
+                     the table size after resizing.
+        """
+        if expected_size is None and hasattr(items, "__len__"):
+            expected_size = len(items)
+        if expected_size:
+            self._reserve(len(self) + expected_size)
+        for key, data in items:
+            self[key] = data
+
+    def _size_index_for(self, count: int) -> int:
+        """
+        Smallest size index (from the current one) whose table can hold count
+        items without growing, or the last possible index if none can.
+        """
+        index = self.size_index
+        size = self.policy.size_at(self.TABLE_SIZES, index)
+        while not self.policy.fits(count, size):
+            next_size = self.policy.size_at(self.TABLE_SIZES, index + 1)
+            if next_size is None:
+                break
+            index, size = index + 1, next_size
+        return index
+
+    def _reserve(self, count: int) -> None:
+        """
+        Resize directly to a table big enough for count items, if needed.
+        """
+        new_index = self._size_index_for(count)
+        if new_index > self.size_index:
+            self._rehash(new_index)
+
     def hash(self, key: K) -> int:
         """
         Hash a key for insert/retrieve/update into the hashtable.
 
-        :complexity: O(len(key))
-        """
+        The slot is derived from the memoized fingerprint of the key, so
+        repeated lookups, probes and rehashes do not walk the key again.
+        Integer (and tuple) keys are hashed directly, see hash_key.
 
-        value = 0
-        a = 31415
-        for char in key:
-            value = (ord(char) + a * value) % self.table_size
-            a = a * self.HASH_BASE % (self.table_size - 1)
-        return value
+        :complexity: O(len(key)) the first time a key is seen, O(1) afterwards.
+        """
+        return hash_key(key) % self.table_size
 
     @property
     def table_size(self) -> int:
@@ -77,9 +166,17 @@ class LinearProbeTable(Generic[K, V]):
         :raises KeyError: When the key is not in the table, but is_insert is False.
         :raises FullError: When a table is full and cannot be inserted.
         """
-        # Initial position
-        position = self.hash(key)
+        return self._probe_from(key, self.hash(key), is_insert)
+
+    def _probe_from(self, key: K, position: int, is_insert: bool) -> int:
+        """
+        Linear probe for key starting at its (already hashed) home position.
 
+        :complexity best: O(1) first position is empty
+        :complexity worst: O(N*comp(K)) when we've searched the entire table
+        :raises KeyError: When the key is not in the table, but is_insert is False.
+        :raises FullError: When a table is full and cannot be inserted.
+        """
         for _ in range(self.table_size):
             if self.array[position] is None:
                 # Empty spot. Am I upserting or retrieving?
@@ -104,11 +201,7 @@ class LinearProbeTable(Generic[K, V]):
 
         :complexity: O(N) where N is self.table_size.
         """
-        res = []
-        for x in range(self.table_size):
-            if self.array[x] is not None:
-                res.append(self.array[x][0])
-        return res
+        return [item[0] for item in self.array if item is not None]
 
     def values(self) -> list[V]:
         """
@@ -116,11 +209,39 @@ class LinearProbeTable(Generic[K, V]):
 
         :complexity: O(N) where N is self.table_size.
         """
-        res = []
-        for x in range(self.table_size):
-            if self.array[x] is not None:
-                res.append(self.array[x][1])
-        return res
+        return [item[1] for item in self.array if item is not None]
+
+    def iter_items(self) -> Iterator[tuple[K, V]]:
+        """
+        Lazily yields all (key, value) pairs in the hash table.
+
+        :complexity: O(1) per step, O(N) in total where N is self.table_size.
+        :raises RuntimeError: if the table is resized during iteration.
+        """
+        array = self.array
+        for x in range(len(array)):
+            if self.array is not array:
+                raise RuntimeError("Hash table resized during iteration")
+            if array[x] is not None:
+                yield array[x]
+
+    def iter_keys(self) -> Iterator[K]:
+        """
+        Lazily yields all keys in the hash table. See iter_items.
+        """
+        return (item[0] for item in self.iter_items())
+
+    def iter_values(self) -> Iterator[V]:
+        """
+        Lazily yields all values in the hash table. See iter_items.
+        """
+        return (item[1] for item in self.iter_items())
+
+    def __iter__(self) -> Iterator[K]:
+        """
+        Iterates over the keys of the hash table. See iter_items.
+        """
+        return self.iter_keys()
 
     def __contains__(self, key: K) -> bool:
         """
@@ -153,63 +274,220 @@ class LinearProbeTable(Generic[K, V]):
         :raises FullError: when the table cannot be resized further.
         """
 
-        position = self._linear_probe(key, True)
+        home = self.hash(key)
+        position = self._probe_from(key, home, True)
 
         if self.array[position] is None:
             self.count += 1
+            self.homes[position] = home
 
         self.array[position] = (key, data)
 
-        if len(self) > self.table_size / 2:
+        if self.policy.should_grow(len(self), self.table_size):
             self._rehash()
 
     def __delitem__(self, key: K) -> None:
         """
         Deletes a (key, value) pair in our hash table.
 
+        Uses backward-shift deletion: later items of the cluster are moved
+        back into the gap based on their stored home slot, so nothing in the
+        cluster is re-hashed and no tombstones are left behind.
+
         :complexity best: O(hash(key)) deleting item is not probed and in correct spot.
-        :complexity worst: O(N*hash(key)+N^2*comp(K)) deleting item is midway through large chain.
+        :complexity worst: O(hash(key) + N*comp(K)) deleting item is midway through large chain.
         :raises KeyError: when the key doesn't exist.
         """
-        position = self._linear_probe(key, False)
-        # Remove the element
-        self.array[position] = None
+        gap = self._linear_probe(key, False)
+        # Remove the element, letting go of it (see ArrayR.release)
+        self.array.release(gap)
         self.count -= 1
         # Start moving over the cluster
-        position = (position + 1) % self.table_size
+        position = (gap + 1) % self.table_size
         while self.array[position] is not None:
-            key2, value = self.array[position]
-            self.array[position] = None
-            # Reinsert.
-            newpos = self._linear_probe(key2, True)
-            self.array[newpos] = (key2, value)
+            home = self.homes[position]
+            if not stays_put(home, gap, position):
+                self.array[gap] = self.array[position]
+                self.homes[gap] = home
+                self.array.release(position)
+                gap = position
             position = (position + 1) % self.table_size
 
+        if self._should_shrink():
+            self._rehash(self.size_index - 1)
+
+    def _should_shrink(self) -> bool:
+        """
+        Whether the shrink policy asks to step back down to the previous size.
+        Only shrinks when the smaller table still fits under the growth policy.
+        """
+        return (
+            self.shrink_threshold is not None
+            and self.size_index > 0
+            and len(self) < self.table_size * self.shrink_threshold
+            and self.policy.fits(len(self), self.policy.size_at(self.TABLE_SIZES, self.size_index - 1))
+        )
+
     def is_empty(self) -> bool:
         return self.count == 0
 
     def is_full(self) -> bool:
         return self.count == self.table_size
 
-    def _rehash(self) -> None:
+    def _rehash(self, new_index: int | None = None) -> None:
         """
         Need to resize table and reinsert all values
 
+        Items are placed straight into the new array in a single pass,
+        without going through __setitem__ (and its resize check).
+
+        :param new_index: size index to resize to, defaults to the next size.
+                          A smaller index shrinks the table.
         :complexity best: O(N*hash(K)) No probing.
         :complexity worst: O(N*hash(K) + N^2*comp(K)) Lots of probing.
         Where N is len(self)
         """
         old_array = self.array
-        self.size_index += 1
-        if self.size_index == len(self.TABLE_SIZES):
+        if new_index is None:
+            new_index = self.size_index + 1
+        new_size = self.policy.size_at(self.TABLE_SIZES, new_index)
+        if new_size is None:
             # Cannot be resized further.
             return
-        self.array = ArrayR(self.TABLE_SIZES[self.size_index])
-        self.count = 0
+        start = time.perf_counter()
+        self.size_index = new_index
+        self.array = ArrayR(new_size)
+        self.homes = ArrayR(self.table_size)
         for item in old_array:
             if item is not None:
-                key, value = item
-                self[key] = value
+                self._place(item, self.hash(item[0]))
+        self._record_rehash(start)
+
+    def _record_rehash(self, start: float) -> None:
+        """
+        Count a finished rehash that started at time.perf_counter() value start.
+        """
+        self.rehash_count += 1
+        self.rehash_time += time.perf_counter() - start
+
+    def _place(self, item: tuple[K, V], home: int) -> None:
+        """
+        Place an item whose key is known not to be in the table.
+
+        :complexity: See linear probe.
+        """
+        position = self._probe_from(item[0], home, True)
+        self.array[position] = item
+        self.homes[position] = home
+
+    def probe_stats(self) -> dict:
+        """
+        Probe-length statistics for the items currently in the table.
+
+        Returns a dict with the maximum and mean probe length (number of
+        slots inspected to find an item, 1 meaning found at its home) and a
+        histogram, where histogram[i] is the number of items with probe length i.
+
+        :complexity: O(N) where N is self.table_size.
+        """
+        histogram = [0]
+        total = 0
+        for position in range(self.table_size):
+            if self.array[position] is not None:
+                length = (position - self.homes[position]) % self.table_size + 1
+                while len(histogram) <= length:
+                    histogram.append(0)
+                histogram[length] += 1
+                total += length
+        return {
+            "max": len(histogram) - 1,
+            "mean": total / self.count if self.count else 0,
+            "histogram": histogram,
+        }
+
+    def copy(self) -> LinearProbeTable[K, V]:
+        """
+        Returns a copy of the table that can be changed independently of it.
+        The keys and values themselves are shared, and counters are not copied.
+
+        :complexity: O(N) where N is self.table_size.
+        """
+        table = copy.copy(self)
+        table.__dict__.pop("_probe_from", None)
+        table.__dict__.pop("counters", None)
+        table._copy_arrays()
+        return table
+
+    def _copy_arrays(self) -> None:
+        """
+        Replace the storage arrays of a shallow copy by copies of them.
+        """
+        array, homes = self.array, self.homes
+        self.array = ArrayR(len(array))
+        self.array.copy_from(array)
+        self.homes = ArrayR(len(homes))
+        self.homes.copy_from(homes)
+
+    def stats(self) -> dict:
+        """
+        Occupancy and probing statistics, for finding out why a table is slow.
+
+        Returns a dict with:
+            - size, count and load_factor of the table,
+            - max_probe and mean_probe, see probe_stats,
+            - rehashes and rehash_time, the number of resizes so far and the
+              seconds spent in them,
+            - counters, the operation counters (see enable_counters) or None.
+
+        :complexity: O(N) where N is self.table_size.
+        """
+        probes = self.probe_stats()
+        return {
+            "size": self.table_size,
+            "count": len(self),
+            "load_factor": len(self) / self.table_size,
+            "max_probe": probes["max"],
+            "mean_probe": probes["mean"],
+            "rehashes": self.rehash_count,
+            "rehash_time": self.rehash_time,
+            "counters": None if self.counters is None else dict(self.counters),
+        }
+
+    def enable_counters(self) -> None:
+        """
+        Start counting probes: "probes" is the number of key searches
+        (including those done while rehashing), "misses" how many of them
+        did not find the key and "probe_length" the total number of slots
+        inspected by the searches that did.
+
+        Counting is switched on by shadowing _probe_from on this table only,
+        so tables without counters pay nothing for it.
+
+        :complexity: O(1)
+        """
+        self.counters = {"probes": 0, "misses": 0, "probe_length": 0}
+        probe_from = type(self)._probe_from
+
+        def counted_probe_from(key: K, position: int, is_insert: bool) -> int:
+            self.counters["probes"] += 1
+            try:
+                found = probe_from(self, key, position, is_insert)
+            except KeyError:
+                self.counters["misses"] += 1
+                raise
+            self.counters["probe_length"] += (found - position) % self.table_size + 1
+            return found
+
+        self._probe_from = counted_probe_from
+
+    def disable_counters(self) -> None:
+        """
+        Stop counting probes and drop the counters.
+
+        :complexity: O(1)
+        """
+        self.__dict__.pop("_probe_from", None)
+        self.__dict__.pop("counters", None)
 
     def __str__(self) -> str:
         """
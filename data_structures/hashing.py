@@ -0,0 +1,81 @@
+""" Shared hashing helpers for the hash table ADTs.
+
+The hash tables used to hash a key directly modulo their current table size,
+which meant every lookup, every probe retry and every reinsertion during a
+rehash walked the whole key again. Instead, a key is reduced once to a
+fingerprint that does not depend on the table size, and each table derives
+its slot from that fingerprint with a single modulo.
+"""
+from __future__ import annotations
+__docformat__ = 'reStructuredText'
+
+from functools import lru_cache
+
+# Large Mersenne prime, so the fingerprint keeps plenty of bits
+# for any table size we will ever use.
+FINGERPRINT_MODULUS = (1 << 61) - 1
+
+# Keys are memoized up to the largest expected table population.
+FINGERPRINT_CACHE_SIZE = 1 << 20
+
+HASH_BASE = 31
+
+FINGERPRINT_MASK = (1 << 64) - 1
+
+
+@lru_cache(maxsize=FINGERPRINT_CACHE_SIZE)
+def fingerprint(key: str) -> int:
+    """
+    Table-size independent fingerprint of a string key.
+
+    Uses the same polynomial scheme as the original table hash, but reduced
+    modulo FINGERPRINT_MODULUS instead of the table size, so the result can
+    be reused for every table size. The result is then scrambled, since the
+    polynomial alone maps keys differing only in their last character to
+    consecutive slots, which builds long clusters under linear probing.
+    Results are memoized (bounded LRU).
+
+    :complexity: O(len(key)) the first time a key is seen, O(1) afterwards.
+    """
+    value = 0
+    a = 31415
+    for char in key:
+        value = (ord(char) + a * value) % FINGERPRINT_MODULUS
+        a = a * HASH_BASE % (FINGERPRINT_MODULUS - 1)
+    return _mix(value)
+
+
+def _mix(value: int) -> int:
+    """
+    Scramble the bits of a 64-bit value (splitmix64 finaliser).
+
+    :complexity: O(1)
+    """
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & FINGERPRINT_MASK
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EB & FINGERPRINT_MASK
+    return value ^ (value >> 31)
+
+
+def hash_key(key: str | int | tuple) -> int:
+    """
+    Table-size independent fingerprint of a key, chosen by key type:
+        - str:    see fingerprint.
+        - int:    the integer is mixed directly, no per-digit work.
+        - tuple:  the fingerprints of the parts are combined.
+
+    :complexity: O(1) for ints, see fingerprint for strings, and the
+                 sum over the parts for tuples.
+    :raises TypeError: for any other key type.
+    """
+    if type(key) is str:
+        return fingerprint(key)
+    if isinstance(key, int):
+        return _mix(key & FINGERPRINT_MASK)
+    if isinstance(key, tuple):
+        value = len(key)
+        for part in key:
+            value = _mix((value * HASH_BASE) ^ hash_key(part))
+        return value
+    if isinstance(key, str):
+        return fingerprint(key)
+    raise TypeError(f"Cannot hash key of type {type(key).__name__}, override hash instead.")
@@ -9,29 +9,57 @@ would be a type called py_object_Array_5). Then (length *
 ctypes.py_object)() is equivalent to the initialisation in MIPS of the
 space to hold the references.
 
+The slots of a freshly created ctypes array are NULL pointers, which
+cannot be read back, so every slot must be set to None first. Rather
+than assigning None slot by slot, for all but small arrays the first slot is set and then copied
+over the rest of the array with memmove, doubling the initialised prefix
+each time. This is safe because ctypes does not own references through
+the raw buffer (it keeps them alive separately), and None never goes away.
+
 Note that while I do check the precondition in __init__ (noone else
 would), I do not check that of getitem or setitem, since that is already
 checked by self.array[index].
 """
+from __future__ import annotations
 __author__ = "Julian Garcia for the __init__ code, Maria Garcia de la Banda for the rest"
 __docformat__ = 'reStructuredText'
 
-from ctypes import py_object
-from typing import TypeVar, Generic
+from ctypes import py_object, memmove, addressof, sizeof
+from typing import TypeVar, Generic, Iterator
 
 T = TypeVar('T')
 
+# Number of slots fetched at once when iterating.
+ITER_CHUNK = 4096
+
+# Below this length, plain slice assignment beats the memmove calls.
+SMALL_ARRAY = 256
+
+# Stored by release in place of an object, to drop the array's hold on it.
+_RELEASED = object()
+
 
 class ArrayR(Generic[T]):
     def __init__(self, length: int) -> None:
         """ Creates an array of references to objects of the given length
-        :complexity: O(length) for best/worst case to initialise to None
+        :complexity: O(length) for best/worst case to initialise to None,
+                     but done by O(log(length)) memmove calls
         :pre: length > 0
         """
         if length <= 0:
             raise ValueError("Array length should be larger than 0.")
         self.array = (length * py_object)() # initialises the space
-        self.array[:] =  [None for _ in range(length)]
+        if length <= SMALL_ARRAY:
+            self.array[:] = [None] * length
+            return
+        self.array[0] = None
+        start = addressof(self.array)
+        slot = sizeof(py_object)
+        done = 1
+        while done < length:
+            block = min(done, length - done)
+            memmove(start + done * slot, start, block * slot)
+            done += block
 
     def __len__(self) -> int:
         """ Returns the length of the array
@@ -39,17 +67,66 @@ class ArrayR(Generic[T]):
         """
         return len(self.array)
 
-    def __getitem__(self, index: int) -> T:
-        """ Returns the object in position index.
-        :complexity: O(1)
+    def __getitem__(self, index: int | slice) -> T | list[T]:
+        """ Returns the object in position index, or a list of the objects
+        in a slice of positions.
+        :complexity: O(1) for an index, O(slice length) for a slice
         :pre: index in between 0 and length - self.array[] checks it
         """
         return self.array[index]
 
-    def __setitem__(self, index: int, value: T) -> None:
-        """ Sets the object in position index to value
-        :complexity: O(1)
+    def __setitem__(self, index: int | slice, value: T) -> None:
+        """ Sets the object in position index to value, or the objects in a
+        slice of positions to the items of value (which must be as long as the slice).
+        :complexity: O(1) for an index, O(slice length) for a slice
         :pre: index in between 0 and length - self.array[] checks it
         """
         self.array[index] = value
 
+    def __iter__(self) -> Iterator[T]:
+        """ Iterates over the objects in the array, fetching them in chunks.
+        :complexity: O(length)
+        """
+        for start in range(0, len(self.array), ITER_CHUNK):
+            yield from self.array[start:start + ITER_CHUNK]
+
+    def fill(self, value: T, start: int = 0, stop: int | None = None) -> None:
+        """ Sets every position in [start, stop) to value.
+        :complexity: O(stop - start), in a single slice assignment
+        """
+        if stop is None:
+            stop = len(self.array)
+        if start < stop:
+            self.array[start:stop] = [value] * (stop - start)
+
+    def release(self, index: int) -> None:
+        """ Sets position index to None and lets go of the object it held.
+        ctypes keeps each stored object alive separately from the slot, and
+        storing None does not release it, so self[index] = None alone would
+        keep the old object alive until the slot is next given an object.
+        Giving it _RELEASED first replaces that hold.
+        :complexity: O(1)
+        :pre: 0 <= index < length
+        """
+        self.array[index] = _RELEASED
+        self.array[index] = None
+
+    def clear(self) -> None:
+        """ Sets every position to None and lets go of the objects the array
+        held, see release.
+        :complexity: O(length), in two slice assignments
+        """
+        self.fill(_RELEASED)
+        self.fill(None)
+
+    def copy_from(self, other: ArrayR[T], start: int = 0, stop: int | None = None) -> None:
+        """ Copies the objects in positions [start, stop) of other into the
+        same positions of this array.
+        :complexity: O(stop - start), in a single slice assignment
+        :pre: stop <= len(self) and stop <= len(other)
+        """
+        if stop is None:
+            stop = min(len(self.array), len(other.array))
+        if start < stop:
+            self.array[start:stop] = other.array[start:stop]
+
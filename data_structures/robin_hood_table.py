@@ -0,0 +1,132 @@
+""" Hash Table ADT
+
+Defines a Hash Table using Robin Hood hashing for conflict resolution.
+"""
+from __future__ import annotations
+
+from data_structures.hash_table import LinearProbeTable, FullError, K, V
+
+
+class RobinHoodTable(LinearProbeTable[K, V]):
+    """
+    Robin Hood Table.
+
+    Same public API as LinearProbeTable, but on insertion an item that has
+    travelled further from its home slot takes the place of one that is
+    closer to its own. This keeps probe lengths short and even, and lets a
+    lookup for an absent key stop as soon as it reaches an item closer to
+    home than the key would be, rather than scanning the rest of the cluster.
+    Because of that, the table can be run at a much higher load factor.
+
+    Type Arguments:
+        - K:    Key Type. In most cases should be string.
+                Otherwise `hash` should be overwritten.
+        - V:    Value Type.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    MAX_LOAD_FACTOR = 0.85
+
+    def _distance(self, position: int) -> int:
+        """
+        How far the item at position is from its home slot.
+        """
+        return (position - self.homes[position]) % self.table_size
+
+    def _probe_from(self, key: K, position: int, is_insert: bool) -> int:
+        """
+        Find the position of key, starting at its home position.
+
+        When the key is absent, stops at the first empty slot or the first
+        item closer to its home than key would be. That is where key belongs
+        (returned if is_insert), although the slot may need to be freed up first.
+
+        :complexity best: O(1) first position is empty
+        :complexity worst: O(L*comp(K)) where L is the longest probe length
+        :raises KeyError: When the key is not in the table, but is_insert is False.
+        :raises FullError: When a table is full and cannot be inserted.
+        """
+        for distance in range(self.table_size):
+            if self.array[position] is None or self._distance(position) < distance:
+                if is_insert:
+                    return position
+                raise KeyError(key)
+            elif self.array[position][0] == key:
+                return position
+            position = (position + 1) % self.table_size
+
+        if is_insert:
+            raise FullError("Table is full!")
+        else:
+            raise KeyError(key)
+
+    def __setitem__(self, key: K, data: V) -> None:
+        """
+        Set an (key, value) pair in our hash table.
+
+        :complexity: See linear probe.
+        :raises FullError: when the table cannot be resized further.
+        """
+        home = self.hash(key)
+        position = self._probe_from(key, home, True)
+
+        if self.array[position] is not None and self.array[position][0] == key:
+            self.array[position] = (key, data)
+            return
+
+        if self.is_full():
+            raise FullError("Table is full!")
+        self._place((key, data), home, position)
+        self.count += 1
+
+        if self.policy.should_grow(len(self), self.table_size):
+            self._rehash()
+
+    def _place(self, item: tuple[K, V], home: int, position: int | None = None) -> None:
+        """
+        Place an item whose key is known not to be in the table.
+
+        Richer items (closer to home) are displaced forward along the
+        cluster until an empty slot is reached.
+
+        :param position: where the item belongs, if already probed.
+        :complexity: O(L) where L is the length of the rest of the cluster.
+        """
+        if position is None:
+            position = self._probe_from(item[0], home, True)
+        distance = (position - home) % self.table_size
+        while self.array[position] is not None:
+            displaced_distance = self._distance(position)
+            if displaced_distance < distance:
+                displaced, displaced_home = self.array[position], self.homes[position]
+                self.array[position], self.homes[position] = item, home
+                item, home, distance = displaced, displaced_home, displaced_distance
+            position = (position + 1) % self.table_size
+            distance += 1
+        self.array[position] = item
+        self.homes[position] = home
+
+    def __delitem__(self, key: K) -> None:
+        """
+        Deletes a (key, value) pair in our hash table.
+
+        Following items are shifted back one slot until one is found at its
+        home (or the cluster ends), so no key is re-hashed.
+
+        :complexity best: O(hash(key)) deleting item is at its home and ends the cluster.
+        :complexity worst: O(hash(key) + L*comp(K)) where L is the longest probe length.
+        :raises KeyError: when the key doesn't exist.
+        """
+        gap = self._linear_probe(key, False)
+        self.array.release(gap)
+        self.count -= 1
+        position = (gap + 1) % self.table_size
+        while self.array[position] is not None and self._distance(position) > 0:
+            self.array[gap], self.homes[gap] = self.array[position], self.homes[position]
+            self.array.release(position)
+            gap = position
+            position = (position + 1) % self.table_size
+
+        if self._should_shrink():
+            self._rehash(self.size_index - 1)
@@ -0,0 +1,194 @@
+""" Small Table ADT
+
+Defines a map for a handful of entries, stored inline and scanned linearly.
+"""
+from __future__ import annotations
+
+from typing import Generic, Iterator
+from data_structures.hash_table import FullError, K, V
+from data_structures.referential_array import ArrayR
+
+
+class SmallTable(Generic[K, V]):
+    """
+    Small Table.
+
+    Holds up to `capacity` entries in a single ArrayR of alternating keys
+    and values, found by a linear scan instead of hashing. For a few entries
+    this is cheaper in both memory and time than a LinearProbeTable, which
+    needs a larger array plus per-table bookkeeping. The array starts with
+    room for one entry and doubles as needed, up to capacity.
+
+    Positions reported by _linear_probe are entry indices in [0, len(self)).
+    Deleting moves the last entry into the freed position.
+
+    Type Arguments:
+        - K:    Key Type.
+        - V:    Value Type.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    # Many of these are created, one per group, so avoid a __dict__ each.
+    __slots__ = ("array", "count", "capacity", "shared")
+
+    def __init__(self, capacity: int = 4) -> None:
+        """
+        Initialise the Small Table.
+        :pre: capacity > 0
+        """
+        self.capacity = capacity
+        self.array: ArrayR[K | V] = ArrayR(2)
+        self.count = 0
+        # Set by DoubleKeyTable.snapshot while a snapshot may still read this table.
+        self.shared = False
+
+    @property
+    def table_size(self) -> int:
+        return self.capacity
+
+    def __len__(self) -> int:
+        """
+        Returns number of elements in the table
+        """
+        return self.count
+
+    def is_empty(self) -> bool:
+        return self.count == 0
+
+    def is_full(self) -> bool:
+        return self.count == self.capacity
+
+    def _linear_probe(self, key: K, is_insert: bool) -> int:
+        """
+        Find the entry index for this key by scanning the entries.
+
+        :complexity: O(len(self)*comp(K))
+        :raises KeyError: When the key is not in the table, but is_insert is False.
+        :raises FullError: When the key is new and the table is full.
+        """
+        for index in range(self.count):
+            if self.array[2 * index] == key:
+                return index
+        if not is_insert:
+            raise KeyError(key)
+        if self.is_full():
+            raise FullError("Table is full!")
+        return self.count
+
+    def copy(self) -> SmallTable[K, V]:
+        """
+        Returns a copy of the table that can be changed independently of it.
+
+        :complexity: O(capacity)
+        """
+        table = SmallTable(self.capacity)
+        table.array = ArrayR(len(self.array))
+        table.array.copy_from(self.array)
+        table.count = self.count
+        return table
+
+    def __contains__(self, key: K) -> bool:
+        """
+        Checks to see if the given key is in the table
+
+        :complexity: See linear probe.
+        """
+        try:
+            self._linear_probe(key, False)
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Get the value at a certain key
+
+        :complexity: See linear probe.
+        :raises KeyError: when the key doesn't exist.
+        """
+        return self.array[2 * self._linear_probe(key, False) + 1]
+
+    def __setitem__(self, key: K, data: V) -> None:
+        """
+        Set an (key, value) pair in the table.
+
+        :complexity: See linear probe, plus O(capacity) when the array grows.
+        :raises FullError: when the key is new and the table is full.
+        """
+        index = self._linear_probe(key, True)
+        if index == self.count:
+            if 2 * index == len(self.array):
+                new_array = ArrayR(min(2 * len(self.array), 2 * self.capacity))
+                new_array.copy_from(self.array)
+                self.array = new_array
+            self.array[2 * index] = key
+            self.count += 1
+        self.array[2 * index + 1] = data
+
+    def __delitem__(self, key: K) -> None:
+        """
+        Deletes a (key, value) pair from the table, moving the last entry into its place.
+
+        :complexity: See linear probe.
+        :raises KeyError: when the key doesn't exist.
+        """
+        index = self._linear_probe(key, False)
+        self.count -= 1
+        last = 2 * self.count
+        self.array[2 * index] = self.array[last]
+        self.array[2 * index + 1] = self.array[last + 1]
+        self.array.release(last)
+        self.array.release(last + 1)
+
+    def iter_items(self) -> Iterator[tuple[K, V]]:
+        """
+        Lazily yields all (key, value) pairs in the table.
+
+        :complexity: O(1) per step.
+        """
+        for index in range(self.count):
+            yield (self.array[2 * index], self.array[2 * index + 1])
+
+    def iter_keys(self) -> Iterator[K]:
+        """
+        Lazily yields all keys in the table.
+        """
+        for index in range(self.count):
+            yield self.array[2 * index]
+
+    def iter_values(self) -> Iterator[V]:
+        """
+        Lazily yields all values in the table.
+        """
+        for index in range(self.count):
+            yield self.array[2 * index + 1]
+
+    def __iter__(self) -> Iterator[K]:
+        return self.iter_keys()
+
+    def keys(self) -> list[K]:
+        """
+        Returns all keys in the table.
+
+        :complexity: O(len(self))
+        """
+        return list(self.iter_keys())
+
+    def values(self) -> list[V]:
+        """
+        Returns all values in the table.
+
+        :complexity: O(len(self))
+        """
+        return list(self.iter_values())
+
+    def __str__(self) -> str:
+        """
+        Returns all they key/value pairs in the table.
+        """
+        result = ""
+        for key, value in self.iter_items():
+            result += "(" + str(key) + "," + str(value) + ")\n"
+        return result
@@ -0,0 +1,237 @@
+""" Hash Table ADT
+
+Defines a Linear Probe Table that stores keys and values in separate arrays.
+"""
+from __future__ import annotations
+
+import time
+from array import array
+from typing import Iterator
+
+from data_structures.hash_table import LinearProbeTable, FullError, K, V, stays_put
+from data_structures.referential_array import ArrayR
+from data_structures.growth_policy import GrowthPolicy
+
+
+class SplitLinearProbeTable(LinearProbeTable[K, V]):
+    """
+    Linear Probe Table with struct-of-arrays storage.
+
+    Same public API as LinearProbeTable, but instead of one array of
+    (key, value) tuples it keeps three parallel arrays: `array` holds the
+    keys (None marks an empty slot), `values_array` the values and `homes`
+    the cached home slot of each key. Homes are stored as machine integers
+    in a compact array rather than as int objects. No tuple is allocated per
+    entry on insert or rehash, and keys() / values() are plain scans of one array.
+
+    Type Arguments:
+        - K:    Key Type. In most cases should be string.
+                Otherwise `hash` should be overwritten.
+        - V:    Value Type.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    def __init__(self, sizes=None, shrink_threshold: float | None = None, policy: GrowthPolicy | None = None) -> None:
+        """
+        Initialise the Hash Table.
+
+        See LinearProbeTable.__init__.
+        """
+        LinearProbeTable.__init__(self, sizes, shrink_threshold, policy)
+        self.values_array:ArrayR[V] = ArrayR(self.table_size)
+        self.homes = self._new_homes(self.table_size)
+
+    @staticmethod
+    def _new_homes(length: int) -> array:
+        """
+        Zeroed compact array of home slots.
+
+        :complexity: O(length), done in C.
+        """
+        return array('q', bytes(8 * length))
+
+    def _probe_from(self, key: K, position: int, is_insert: bool) -> int:
+        """
+        Linear probe for key starting at its (already hashed) home position.
+
+        :complexity best: O(1) first position is empty
+        :complexity worst: O(N*comp(K)) when we've searched the entire table
+        :raises KeyError: When the key is not in the table, but is_insert is False.
+        :raises FullError: When a table is full and cannot be inserted.
+        """
+        for _ in range(self.table_size):
+            if self.array[position] is None:
+                if is_insert:
+                    return position
+                raise KeyError(key)
+            elif self.array[position] == key:
+                return position
+            position = (position + 1) % self.table_size
+
+        if is_insert:
+            raise FullError("Table is full!")
+        else:
+            raise KeyError(key)
+
+    def _copy_arrays(self) -> None:
+        """
+        Replace the storage arrays of a shallow copy by copies of them.
+        """
+        keys, values = self.array, self.values_array
+        self.array = ArrayR(len(keys))
+        self.array.copy_from(keys)
+        self.values_array = ArrayR(len(values))
+        self.values_array.copy_from(values)
+        self.homes = self.homes[:]
+
+    def keys(self) -> list[K]:
+        """
+        Returns all keys in the hash table.
+
+        :complexity: O(N) where N is self.table_size.
+        """
+        return [key for key in self.array if key is not None]
+
+    def values(self) -> list[V]:
+        """
+        Returns all values in the hash table.
+
+        :complexity: O(N) where N is self.table_size.
+        """
+        return [self.values_array[x] for x in range(self.table_size) if self.array[x] is not None]
+
+    def iter_keys(self) -> Iterator[K]:
+        """
+        Lazily yields all keys in the hash table.
+
+        :complexity: O(1) per step, O(N) in total where N is self.table_size.
+        :raises RuntimeError: if the table is resized during iteration.
+        """
+        keys = self.array
+        for x in range(len(keys)):
+            if self.array is not keys:
+                raise RuntimeError("Hash table resized during iteration")
+            if keys[x] is not None:
+                yield keys[x]
+
+    def iter_values(self) -> Iterator[V]:
+        """
+        Lazily yields all values in the hash table. See iter_keys.
+        """
+        keys, values = self.array, self.values_array
+        for x in range(len(keys)):
+            if self.array is not keys:
+                raise RuntimeError("Hash table resized during iteration")
+            if keys[x] is not None:
+                yield values[x]
+
+    def iter_items(self) -> Iterator[tuple[K, V]]:
+        """
+        Lazily yields all (key, value) pairs in the hash table. See iter_keys.
+        """
+        keys, values = self.array, self.values_array
+        for x in range(len(keys)):
+            if self.array is not keys:
+                raise RuntimeError("Hash table resized during iteration")
+            if keys[x] is not None:
+                yield (keys[x], values[x])
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Get the value at a certain key
+
+        :complexity: See linear probe.
+        :raises KeyError: when the key doesn't exist.
+        """
+        return self.values_array[self._linear_probe(key, False)]
+
+    def __setitem__(self, key: K, data: V) -> None:
+        """
+        Set an (key, value) pair in our hash table.
+
+        :complexity: See linear probe.
+        :raises FullError: when the table cannot be resized further.
+        """
+        home = self.hash(key)
+        position = self._probe_from(key, home, True)
+
+        if self.array[position] is None:
+            self.count += 1
+            self.array[position] = key
+            self.homes[position] = home
+
+        self.values_array[position] = data
+
+        if self.policy.should_grow(len(self), self.table_size):
+            self._rehash()
+
+    def __delitem__(self, key: K) -> None:
+        """
+        Deletes a (key, value) pair in our hash table, using backward-shift deletion.
+
+        :complexity best: O(hash(key)) deleting item is not probed and in correct spot.
+        :complexity worst: O(hash(key) + N*comp(K)) deleting item is midway through large chain.
+        :raises KeyError: when the key doesn't exist.
+        """
+        gap = self._linear_probe(key, False)
+        self.array.release(gap)
+        self.values_array.release(gap)
+        self.count -= 1
+        position = (gap + 1) % self.table_size
+        while self.array[position] is not None:
+            home = self.homes[position]
+            if not stays_put(home, gap, position):
+                self.array[gap] = self.array[position]
+                self.values_array[gap] = self.values_array[position]
+                self.homes[gap] = home
+                self.array.release(position)
+                self.values_array.release(position)
+                gap = position
+            position = (position + 1) % self.table_size
+
+        if self._should_shrink():
+            self._rehash(self.size_index - 1)
+
+    def _rehash(self, new_index: int | None = None) -> None:
+        """
+        Resize the table and move every entry across.
+
+        :param new_index: size index to resize to, defaults to the next size.
+        :complexity best: O(N*hash(K)) No probing.
+        :complexity worst: O(N*hash(K) + N^2*comp(K)) Lots of probing.
+        Where N is len(self)
+        """
+        if new_index is None:
+            new_index = self.size_index + 1
+        new_size = self.policy.size_at(self.TABLE_SIZES, new_index)
+        if new_size is None:
+            # Cannot be resized further.
+            return
+        start = time.perf_counter()
+        old_keys, old_values = self.array, self.values_array
+        self.size_index = new_index
+        self.array = ArrayR(new_size)
+        self.values_array = ArrayR(new_size)
+        self.homes = self._new_homes(new_size)
+        for x in range(len(old_keys)):
+            key = old_keys[x]
+            if key is not None:
+                home = self.hash(key)
+                position = self._probe_from(key, home, True)
+                self.array[position] = key
+                self.values_array[position] = old_values[x]
+                self.homes[position] = home
+        self._record_rehash(start)
+
+    def __str__(self) -> str:
+        """
+        Returns all they key/value pairs in our hash table (no particular
+        order).
+        :complexity: O(N * (str(key) + str(value))) where N is the table size
+        """
+        result = ""
+        for x in range(self.table_size):
+            if self.array[x] is not None:
+                result += "(" + str(self.array[x]) + "," + str(self.values_array[x]) + ")\n"
+        return result
@@ -1,23 +1,48 @@
 from __future__ import annotations
 
-from typing import Generic, TypeVar, Iterator
-from data_structures.hash_table import LinearProbeTable, FullError
+import time
+from typing import Callable, Generic, Iterable, TypeVar, Iterator
+from data_structures.hash_table import LinearProbeTable, FullError, stays_put
 from data_structures.referential_array import ArrayR
+from data_structures.growth_policy import GrowthPolicy
+from data_structures.hashing import hash_key
+from data_structures.small_table import SmallTable
 
 K1 = TypeVar('K1')
 K2 = TypeVar('K2')
 V = TypeVar('V')
 
 
+class BottomTable(LinearProbeTable[K2, V]):
+    """
+    Bottom-level table of a DoubleKeyTable.
+
+    Hashes its keys with the owner's hash2, looked up at call time so that
+    overriding hash2 on the owner applies to every bottom-level table. This
+    replaces a per-table `hash` closure.
+    """
+
+    # Set by DoubleKeyTable.snapshot while a snapshot may still read this table.
+    shared = False
+
+    def __init__(self, owner: DoubleKeyTable[K1, K2, V], sizes: list | None, policy: GrowthPolicy,
+                 shrink_threshold: float | None = None) -> None:
+        LinearProbeTable.__init__(self, sizes, shrink_threshold, policy)
+        self.owner = owner
+
+    def hash(self, key: K2) -> int:
+        return self.owner.hash2(key, self)
+
+
 class DoubleKeyTable(Generic[K1, K2, V]):
     """
     Double Hash Table.
 
     Type Arguments:
-        - K1:   1st Key Type. In most cases should be string.
-                Otherwise `hash1` should be overwritten.
-        - K2:   2nd Key Type. In most cases should be string.
-                Otherwise `hash2` should be overwritten.
+        - K1:   1st Key Type. In most cases should be string or int
+                (or a tuple of those). Otherwise `hash1` should be overwritten.
+        - K2:   2nd Key Type. In most cases should be string or int
+                (or a tuple of those). Otherwise `hash2` should be overwritten.
         - V:    Value Type.
 
     Unless stated otherwise, all methods have O(1) complexity.
@@ -29,42 +54,135 @@ class DoubleKeyTable(Generic[K1, K2, V]):
 
     HASH_BASE = 31
 
-    def __init__(self, sizes: list | None = None, internal_sizes: list | None = None) -> None:
+    # Default number of entries a top-level key keeps inline before its
+    # bottom-level table is switched to a hashed LinearProbeTable.
+    INLINE_THRESHOLD = 4
+
+    # Default load factor below which deleting steps the table back down a size.
+    SHRINK_THRESHOLD = 0.125
+
+    # Resize history and operation counters of the top-level table, see stats().
+    rehash_count = 0
+    rehash_time = 0.0
+    counters: dict | None = None
+
+    def __init__(self, sizes: list | None = None, internal_sizes: list | None = None,
+                 policy: GrowthPolicy | None = None, internal_policy: GrowthPolicy | None = None,
+                 inline_threshold: int | None = None, reverse_index: bool = False,
+                 shrink_threshold: float | None = None, internal_shrink_threshold: float | None = None) -> None:
+        """
+        Initialise the Double Key Table.
+
+        :param policy: growth policy for the top-level table. By default the
+                       table grows past the end of TABLE_SIZES, but not past
+                       the end of explicitly given sizes.
+        :param internal_policy: growth policy for the bottom-level tables,
+                                with the same default relative to internal_sizes.
+        :param inline_threshold: up to this many entries per top-level key are
+                                 kept in a SmallTable, scanned linearly, before
+                                 switching to a hashed table. Defaults to
+                                 INLINE_THRESHOLD, or 0 (always hashed) when
+                                 internal_sizes is given.
+        :param reverse_index: also keep a reverse index from bottom-level keys
+                              to top-level keys, for keys_for_second and
+                              values_for_second. Off by default, as every
+                              insert and delete then updates two tables.
+                              The index hashes with hash_key, so bottom-level
+                              keys must be strings, ints or tuples of those.
+        :param shrink_threshold: deleting steps the top-level table back down a
+                                 size once its load factor falls below this.
+                                 Defaults to SHRINK_THRESHOLD, or 0 (never
+                                 shrink) when sizes is given.
+        :param internal_shrink_threshold: the same for the bottom-level tables,
+                                          relative to internal_sizes.
+        """
+        if policy is None:
+            policy = GrowthPolicy(extend=sizes is None)
+        if internal_policy is None:
+            internal_policy = GrowthPolicy(extend=internal_sizes is None)
+        if shrink_threshold is None:
+            shrink_threshold = self.SHRINK_THRESHOLD if sizes is None else 0
+        if internal_shrink_threshold is None:
+            internal_shrink_threshold = self.SHRINK_THRESHOLD if internal_sizes is None else 0
+        if inline_threshold is None:
+            inline_threshold = self.INLINE_THRESHOLD if internal_sizes is None else 0
         if sizes is not None:
             self.TABLE_SIZES = sizes
+        self.policy = policy
+        self.shrink_threshold = shrink_threshold
         self.size_slot = 0
-        self.array: ArrayR[tuple[K1, LinearProbeTable]] = ArrayR(self.TABLE_SIZES[self.size_slot])
+        self.array: ArrayR[tuple[K1, LinearProbeTable | SmallTable]] = ArrayR(self.TABLE_SIZES[self.size_slot])
         self.inter_sizes = internal_sizes
+        self.inter_policy = internal_policy
+        self.inter_shrink_threshold = internal_shrink_threshold
+        self.inline_threshold = inline_threshold
         self.count = 0
+        # Maps (key2, key1) to the same value as (key1, key2), when enabled.
+        self.reverse: DoubleKeyTable[K2, K1, V] | None = DoubleKeyTable() if reverse_index else None
+
+    def _new_table(self) -> LinearProbeTable[K2, V] | SmallTable[K2, V]:
+        """
+        Create the bottom-level table for a new top-level key.
+        """
+        if self.inline_threshold > 0:
+            return SmallTable(self.inline_threshold)
+        return self._new_bottom_table()
+
+    def _new_bottom_table(self) -> LinearProbeTable[K2, V]:
+        """
+        Create an empty hashed bottom-level table.
+        """
+        return BottomTable(self, self.inter_sizes, self.inter_policy, self.inter_shrink_threshold)
 
+    def _writable_table(self, position_1: int) -> LinearProbeTable[K2, V] | SmallTable[K2, V]:
+        """
+        Returns the bottom-level table at position_1, first replacing it by a
+        copy if a snapshot shares it.
+
+        :complexity: O(1), or O(T) to copy a shared table of size T.
+        """
+        key1, table = self.array[position_1]
+        if table.shared:
+            table = table.copy()
+            table.shared = False
+            self.array[position_1] = (key1, table)
+        return table
+
+    def _promote(self, position_1: int, expected_size: int = 1) -> LinearProbeTable[K2, V]:
+        """
+        Replace the full SmallTable at position_1 by a hashed bottom-level table,
+        sized for expected_size more entries.
+
+        :complexity: O(T) where T is the size of the new table.
+        """
+        key1, small = self.array[position_1]
+        table = self._new_bottom_table()
+        table.update(small.iter_items(), len(small) + expected_size)
+        self.array[position_1] = (key1, table)
+        return table
 
     def hash1(self, key: K1) -> int:
         """
         Hash the 1st key for insert/retrieve/update into the hashtable.
 
-        :complexity: O(len(key))
-        """
+        The hash is chosen by key type (see hash_key), so integer keys such
+        as difficulty levels are mixed directly rather than walked as strings.
 
-        value = 0
-        a = 31415
-        for char in key:
-            value = (ord(char) + a * value) % self.table_size
-            a = a * self.HASH_BASE % (self.table_size - 1)
-        return value
+        :complexity: O(1) for int keys and previously seen string keys,
+                     O(len(key)) otherwise.
+        """
+        return hash_key(key) % self.table_size
 
     def hash2(self, key: K2, sub_table: LinearProbeTable[K2, V]) -> int:
         """
         Hash the 2nd key for insert/retrieve/update into the hashtable.
 
-        :complexity: O(len(key))
-        """
+        See hash1.
 
-        value = 0
-        a = 31415
-        for char in key:
-            value = (ord(char) + a * value) % sub_table.table_size
-            a = a * self.HASH_BASE % (sub_table.table_size - 1)
-        return value
+        :complexity: O(1) for int keys and previously seen string keys,
+                     O(len(key)) otherwise.
+        """
+        return hash_key(key) % sub_table.table_size
 
     def _linear_probe(self, key1: K1, key2: K2, is_insert: bool) -> tuple[int, int]:
         """
@@ -73,41 +191,72 @@ class DoubleKeyTable(Generic[K1, K2, V]):
         :raises KeyError: When the key pair is not in the table, but is_insert is False.
         :raises FullError: When a table is full and cannot be inserted.
         """
+        position_1 = self._probe_top(key1, is_insert)
+        inter_table = self.array[position_1][1]
+        return (position_1, inter_table._linear_probe(key2, is_insert))
+
+    def _probe_top(self, key1: K1, is_insert: bool) -> int:
+        """
+        Find the position of key1 in the top-level table using linear probing.
+        When inserting a new key1, its bottom-level table is created.
+
+        :complexity best: O(hash1(key1)) first position is empty
+        :complexity worst: O(hash1(key1) + N*comp(K1)) when we've searched the entire table
+                           where N is the tablesize
+        :raises KeyError: When key1 is not in the table, but is_insert is False.
+        :raises FullError: When the table is full and cannot be inserted.
+        """
         position_1 = self.hash1(key1)
-        while True:
+        for _ in range(self.table_size):
             if self.array[position_1] is None:
                 if is_insert:
-                    n_table = LinearProbeTable(self.inter_sizes)
-                    n_table.hash = lambda k: self.hash2(k, n_table)
-                    self.array[position_1] = (key1, n_table)
+                    self.array[position_1] = (key1, self._new_table())
                     self.count += 1
-                    break
+                    return position_1
                 else:
                     raise KeyError(key1)
-
             elif self.array[position_1][0] == key1:
-                break
+                return position_1
             else:
                 position_1 = (position_1 + 1) % self.table_size
 
-
-        inter_table = self.array[position_1][1]
-        position_2 = self.hash2(key2, inter_table)
-        for _ in range(inter_table.table_size):
-            if self.array[position_1][1].array[position_2] is None:
-                if is_insert:
-                    return (position_1, position_2)
-                else:
-                    raise KeyError(key2)
-            elif inter_table.array[position_2][0] == key2:
-                return (position_1, position_2)
-            else:
-                position_2 = (position_2 + 1) % inter_table.table_size
-
         if is_insert:
-            raise FullError("Table=full")
+            raise FullError("Table is full!")
         else:
-            raise KeyError(key2)
+            raise KeyError(key1)
+
+    def sub_table(self, key: K1) -> LinearProbeTable[K2, V] | SmallTable[K2, V]:
+        """
+        Returns the bottom-level table for top-level key, whose len() is
+        the number of entries under that key. It should not be modified directly.
+
+        :complexity: See _probe_top.
+        :raises KeyError: when the key doesn't exist.
+        """
+        return self.array[self._probe_top(key, False)][1]
+
+    def _sub_table_or_none(self, key: K1) -> LinearProbeTable[K2, V] | SmallTable[K2, V] | None:
+        """
+        Returns the bottom-level table for top-level key, or None if there is none.
+        """
+        try:
+            return self.sub_table(key)
+        except KeyError:
+            return None
+
+    def _iter_tables(self) -> Iterator[tuple[K1, LinearProbeTable[K2, V] | SmallTable[K2, V]]]:
+        """
+        Lazily yields every (top-level key, bottom-level table) pair.
+
+        :complexity: O(1) per step, O(N) in total where N is self.table_size.
+        :raises RuntimeError: if the table is resized during iteration.
+        """
+        array = self.array
+        for x in range(len(array)):
+            if self.array is not array:
+                raise RuntimeError("Hash table resized during iteration")
+            if array[x] is not None:
+                yield array[x]
 
     def iter_keys(self, key: K1 | None = None) -> Iterator[K1 | K2]:
         """
@@ -115,52 +264,26 @@ class DoubleKeyTable(Generic[K1, K2, V]):
             Returns an iterator of all top-level keys in hash table
         key = k:
             Returns an iterator of all keys in the bottom-hash-table for k.
-        """
-        if key is not None:
-
-            for ele in self.array:
-                if ele is not None:
-                    (ar_key, value) = ele
-                    if key == ar_key:
-                        for ar in value.array:
-                            if ar is not None:
-                                (inter_key, value) = ar
-                                self.curr_key = inter_key
-                                break
-        else:
-            for ele in self.array:
-                if ele is not None:
-                    (top_key, value) = ele
-                    self.curr_key = top_key
-                    break
 
-        return iter(self)
+        The iterator walks the tables once, and holds its own position, so
+        several iterations can run at the same time. For a given k, the
+        bottom-level table is found by probing rather than by a scan.
+
+        :complexity: O(N + M) in total for key = None, where N is self.table_size
+                     and M the sum of the bottom-level table sizes.
+                     O(hash1(k) + M) for key = k, where M is the size of k's table.
+        """
+        if key is None:
+            return (top_key for top_key, _ in self._iter_tables())
+        table = self._sub_table_or_none(key)
+        return iter(()) if table is None else table.iter_keys()
 
     def keys(self, key: K1 | None = None) -> list[K1]:
         """
         key = None: returns all top-level keys in the table.
         key = x: returns all bottom-level keys for top-level key x.
         """
-        list_key = []
-
-        if key is not None:
-
-            for ele in self.array:
-                if ele is not None:
-                    (ar_key, value) = ele
-                    if key == ar_key:
-                        for ar in value.array:
-                            if ar is not None:
-                                (inter_key, value) = ar
-                                list_key.append(inter_key)
-
-        else:
-            for ele in self.array:
-                if ele is not None:
-                    (top_key, value) = ele
-                    list_key.append(top_key)
-
-        return list_key
+        return list(self.iter_keys(key))
 
     def iter_values(self, key: K1 | None = None) -> Iterator[V]:
         """
@@ -168,52 +291,60 @@ class DoubleKeyTable(Generic[K1, K2, V]):
             Returns an iterator of all values in hash table
         key = k:
             Returns an iterator of all values in the bottom-hash-table for k.
-        """
-        self.iter_num = 0
-
-
-        if key is not None:
-            for ele in self.array:
-                if ele is not None:
-                    (ar_key, value) = ele
-                    if key == ar_key:
-                        for ar in value.array:
-                            if ar is not None:
-                                (inter_key, value) = ar
-                                self.curr_value = value
-                                break
-        else:
-            for ele in self.array:
-                if ele is not None:
-                    (ar_key, value) = ele
-                    for ar in value.array:
-                        if ar is not None:
-                            (inter_key, value) = ar
-                            self.curr_value = value
-                            break
 
-        return iter(self)
+        :complexity: See iter_keys.
+        """
+        if key is None:
+            return (value for _, table in self._iter_tables() for value in table.iter_values())
+        table = self._sub_table_or_none(key)
+        return iter(()) if table is None else table.iter_values()
 
     def values(self, key: K1 | None = None) -> list[V]:
         """
         key = None: returns all values in the table.
         key = x: returns all values for top-level key x.
         """
-        list_val = []
+        return list(self.iter_values(key))
+
+    def _reverse_index(self) -> DoubleKeyTable[K2, K1, V]:
+        """
+        Returns the reverse index.
+
+        :raises ValueError: if the table was created without reverse_index.
+        """
+        if self.reverse is None:
+            raise ValueError("Table was created without reverse_index.")
+        return self.reverse
+
+    def keys_for_second(self, key: K2) -> list[K1]:
+        """
+        Returns all top-level keys that have key as a bottom-level key.
+
+        :complexity: O(hash(key) + R) where R is the number of results.
+        :raises ValueError: if the table was created without reverse_index.
+        """
+        return self._reverse_index().keys(key)
 
+    def values_for_second(self, key: K2) -> list[V]:
+        """
+        Returns the values of every (k1, key) entry, in the same order as keys_for_second.
 
-        for ele in self.array:
-            if ele is not None:
-                (ar_key, value) = ele
-                if key is not None and key != ar_key:
-                    continue
+        :complexity: O(hash(key) + R) where R is the number of results.
+        :raises ValueError: if the table was created without reverse_index.
+        """
+        return self._reverse_index().values(key)
 
-                for ar in value.array:
-                    if ar is not None:
-                        (inter_key, value) = ar
-                        list_val.append(value)
+    def iter_items(self) -> Iterator[tuple[tuple[K1, K2], V]]:
+        """
+        Returns an iterator of all ((key1, key2), value) entries in the hash table.
 
-        return list_val
+        :complexity: See iter_keys.
+        """
+        return (
+            ((top_key, bottom_key), value)
+            for top_key, table in self._iter_tables()
+            for bottom_key, value in table.iter_items()
+        )
 
     def __contains__(self, key: tuple[K1, K2]) -> bool:
         """
@@ -234,57 +365,346 @@ class DoubleKeyTable(Generic[K1, K2, V]):
 
         :raises KeyError: when the key doesn't exist.
         """
-        position = self._linear_probe(key[0], key[1], False)
-        return self.array[position[0]][1].__getitem__(key[1])
+        return self.sub_table(key[0])[key[1]]
 
     def __setitem__(self, key: tuple[K1, K2], data: V) -> None:
         """
         Set an (key, value) pair in our hash table.
+
+        A top-level key's SmallTable is promoted to a hashed table once a new
+        entry no longer fits in it.
         """
-        position = self._linear_probe(key[0], key[1], True)
-        if not self.array[position[0]]:
-            self.count += 1
-        self.array[position[0]][1].__setitem__(key[1], data)
-        if len(self) > self.table_size / 2:
+        position_1 = self._probe_top(key[0], True)
+        table = self._writable_table(position_1)
+        if isinstance(table, SmallTable) and table.is_full() and key[1] not in table:
+            table = self._promote(position_1)
+        table[key[1]] = data
+        if self.reverse is not None:
+            self.reverse[key[1], key[0]] = data
+        if self.policy.should_grow(len(self), self.table_size):
             self._rehash()
 
+    @staticmethod
+    def _runs(entries: Iterable, key_of: Callable) -> Iterator[tuple[K1, list]]:
+        """
+        Splits entries into runs of consecutive entries with the same top-level key.
+
+        :complexity: O(1) per entry, plus comp(K1).
+        """
+        group, key1 = [], None
+        for entry in entries:
+            entry_key1 = key_of(entry)
+            if group and entry_key1 != key1:
+                yield key1, group
+                group = []
+            key1 = entry_key1
+            group.append(entry)
+        if group:
+            yield key1, group
+
+    def set_many(self, items: Iterable[tuple[tuple[K1, K2], V]]) -> None:
+        """
+        Set every ((key1, key2), value) pair, in order.
+
+        Consecutive pairs with the same key1 are set as a group: key1 is
+        hashed and probed once per group, and the group's bottom-level table
+        is resized at most once up front. Batches sorted or grouped by key1
+        get the most out of this.
+
+        :complexity: O(G*hash1(K1) + N*hash2(K2)) where G is the number of
+                     groups and N the number of pairs, excluding probing.
+        :raises FullError: when a table cannot be resized further.
+        """
+        for key1, group in self._runs(items, lambda item: item[0][0]):
+            position_1 = self._probe_top(key1, True)
+            table = self._writable_table(position_1)
+            start = 0
+            if isinstance(table, SmallTable):
+                while start < len(group):
+                    (_, key2), data = group[start]
+                    if table.is_full() and key2 not in table:
+                        table = self._promote(position_1, len(group) - start)
+                        break
+                    table[key2] = data
+                    start += 1
+            if start < len(group):
+                table.update(((key2, data) for (_, key2), data in group[start:]), len(group) - start)
+            if self.reverse is not None:
+                for (_, key2), data in group:
+                    self.reverse[key2, key1] = data
+            if self.policy.should_grow(len(self), self.table_size):
+                self._rehash()
+
+    def get_many(self, keys: Iterable[tuple[K1, K2]]) -> list[V]:
+        """
+        Get the value for every (key1, key2) pair, in order.
+
+        Consecutive pairs with the same key1 share one probe of the top-level
+        table, see set_many.
+
+        :complexity: O(G*hash1(K1) + N*hash2(K2)) where G is the number of
+                     groups and N the number of pairs, excluding probing.
+        :raises KeyError: when a key doesn't exist.
+        """
+        result = []
+        for key1, group in self._runs(keys, lambda key: key[0]):
+            table = self.sub_table(key1)
+            for _, key2 in group:
+                result.append(table[key2])
+        return result
+
     def __delitem__(self, key: tuple[K1, K2]) -> None:
         """
         Deletes a (key, value) pair in our hash table.
 
+        A top-level key whose bottom-level table becomes empty is removed with
+        backward-shift deletion, so keys that probed past it stay reachable.
+
+        :complexity best: O(hash1(K1) + hash2(K2)) no cluster after the top-level key.
+        :complexity worst: O(N*hash1(K1) + M*comp(K2)) when the cluster after the
+                           top-level key covers the table, where N is self.table_size
+                           and M the bottom-level table size.
         :raises KeyError: when the key doesn't exist.
         """
-        position = self._linear_probe(key[0], key[1], False)
-        del self.array[position[0]][1][key[1]]
-        if self.array[position[0]][1].count == 0:
-            self.array[position[0]] = None
-            self.count -= 1
+        position_1 = self._probe_top(key[0], False)
+        inter_table = self._writable_table(position_1)
+        del inter_table[key[1]]
+        if inter_table.count == 0:
+            self._remove_top(position_1)
+            if self._should_shrink():
+                self._rehash(self.size_slot - 1)
+        if self.reverse is not None:
+            del self.reverse[key[1], key[0]]
+
+    def _remove_top(self, gap: int) -> None:
+        """
+        Remove the top-level entry at gap, moving back later entries of its
+        cluster that would otherwise be cut off from their home slot.
+
+        :complexity: O(C*hash1(K1)) where C is the length of the rest of the cluster.
+        """
+        self.array.release(gap)
+        self.count -= 1
+        position = (gap + 1) % self.table_size
+        while self.array[position] is not None:
+            home = self.hash1(self.array[position][0])
+            if not stays_put(home, gap, position):
+                self.array[gap] = self.array[position]
+                self.array.release(position)
+                gap = position
+            position = (position + 1) % self.table_size
+
+    def _should_shrink(self) -> bool:
+        """
+        Whether the top-level table should step back down to the previous size.
+        Only shrinks when the smaller table still fits under the growth policy.
+        """
+        return (
+            self.size_slot > 0
+            and len(self) < self.table_size * self.shrink_threshold
+            and self.policy.fits(len(self), self.policy.size_at(self.TABLE_SIZES, self.size_slot - 1))
+        )
 
-    def _rehash(self) -> None:
+    def compact(self) -> None:
         """
-        Need to resize table and reinsert all values
+        Shrink every table to the smallest size that holds its entries.
+
+        The top-level table is rebuilt at the first size that fits, hashed
+        bottom-level tables are rebuilt the same way, and those with at most
+        inline_threshold entries go back to a SmallTable. The reverse index,
+        if any, is compacted too.
 
-        :complexity best: O(N*hash(K)) No probing.
-        :complexity worst: O(N*hash(K) + N^2*comp(K)) Lots of probing.
-        Where N is len(self)
+        :complexity: O(N*hash1(K1) + M*hash2(K2)) excluding probing, where N is
+                     self.table_size and M the sum of the bottom-level table sizes.
+        """
+        for position_1 in range(self.table_size):
+            entry = self.array[position_1]
+            if entry is None or isinstance(entry[1], SmallTable):
+                continue
+            key1, table = entry
+            if len(table) <= self.inline_threshold:
+                compacted = SmallTable(self.inline_threshold)
+                for key2, data in table.iter_items():
+                    compacted[key2] = data
+            else:
+                compacted = self._new_bottom_table()
+                compacted.update(table.iter_items(), len(table))
+            self.array[position_1] = (key1, compacted)
+
+        new_slot = 0
+        while new_slot < self.size_slot and not self.policy.fits(len(self), self.policy.size_at(self.TABLE_SIZES, new_slot)):
+            new_slot += 1
+        if new_slot < self.size_slot:
+            self._rehash(new_slot)
+
+        if self.reverse is not None:
+            self.reverse.compact()
+
+    def _rehash(self, new_slot: int | None = None) -> None:
+        """
+        Need to resize table and move all bottom-level tables across.
+
+        Each bottom-level table is moved as a whole, so only its top-level
+        key is re-hashed, and its entries (and already-grown array) are kept as is.
+
+        :complexity best: O(N*hash1(K1)) No probing.
+        :complexity worst: O(N*hash1(K1) + N^2*comp(K1)) Lots of probing.
+        Where N is len(self), the number of top-level keys.
+
+        :param new_slot: size index to resize to, defaults to the next size.
+                         A smaller index shrinks the table.
         """
         prev_array = self.array
-        self.size_slot += 1
-        if self.size_slot == len(self.TABLE_SIZES):
+        if new_slot is None:
+            new_slot = self.size_slot + 1
+        new_size = self.policy.size_at(self.TABLE_SIZES, new_slot)
+        if new_size is None:
             return
-        self.array = ArrayR(self.TABLE_SIZES[self.size_slot])
-        self.count = 0
+        start = time.perf_counter()
+        self.size_slot = new_slot
+        self.array = ArrayR(new_size)
 
         for ele in prev_array:
             if ele is None:
                 continue
+            # Top-level keys are unique, so the first empty slot is the one.
+            position_1 = self.hash1(ele[0])
+            while self.array[position_1] is not None:
+                position_1 = (position_1 + 1) % self.table_size
+            self.array[position_1] = ele
+        self.rehash_count += 1
+        self.rehash_time += time.perf_counter() - start
 
-            key1, value1 = ele
-            for internal_ele in value1.array:
-                if internal_ele is None:
-                    continue
-                key2, value2 = internal_ele
-                self[(key1, key2)] = value2
+    def snapshot(self) -> DoubleKeyTableSnapshot[K1, K2, V]:
+        """
+        Returns a read-only view of the table as it is now.
+
+        The view shares the bottom-level tables with this table, which marks
+        them as shared and copies each one before it next writes to it, so
+        later changes to this table do not show in the view.
+
+        :complexity: O(N) where N is self.table_size.
+        """
+        view = DoubleKeyTableSnapshot.__new__(DoubleKeyTableSnapshot)
+        view.__dict__.update(self.__dict__)
+        view.__dict__.pop("_probe_top", None)
+        view.__dict__.pop("counters", None)
+        view.array = ArrayR(self.table_size)
+        view.array.copy_from(self.array)
+        for entry in self.array:
+            if entry is not None:
+                entry[1].shared = True
+        if self.reverse is not None:
+            view.reverse = self.reverse.snapshot()
+        return view
+
+    def stats(self) -> dict:
+        """
+        Occupancy and probing statistics, for finding out why a table is slow.
+
+        Returns a dict with:
+            - size, count (top-level keys), entries (key pairs) and load_factor
+              of the top-level table,
+            - max_probe and mean_probe, the number of top-level slots inspected
+              to find each top-level key,
+            - rehashes and rehash_time, the number of top-level resizes so far
+              and the seconds spent in them,
+            - inner_load_factor, the mean load factor of the bottom-level tables,
+            - inner_max_probe and inner_mean_probe, over every entry of every
+              bottom-level table (an inline entry takes one comparison per
+              entry before it),
+            - inner_rehashes and inner_rehash_time, summed over the current
+              hashed bottom-level tables,
+            - inner_sizes, mapping a number of entries to how many top-level
+              keys have that many, and inline_tables, how many are SmallTables,
+            - counters, the top-level operation counters (see enable_counters) or None.
+
+        :complexity: O(N*hash1(K1) + M) where N is self.table_size and M the
+                     sum of the bottom-level table sizes.
+        """
+        entries = 0
+        max_probe = total_probe = 0
+        inner_load = 0.0
+        inner_max_probe = inner_total_probe = 0
+        inner_rehashes, inner_rehash_time = 0, 0.0
+        inner_sizes = {}
+        inline_tables = 0
+        for position_1 in range(self.table_size):
+            if self.array[position_1] is None:
+                continue
+            key1, table = self.array[position_1]
+            length = (position_1 - self.hash1(key1)) % self.table_size + 1
+            max_probe = max(max_probe, length)
+            total_probe += length
+
+            entries += len(table)
+            inner_load += len(table) / table.table_size
+            inner_sizes[len(table)] = inner_sizes.get(len(table), 0) + 1
+            if isinstance(table, SmallTable):
+                inline_tables += 1
+                # Entry i is found after i + 1 comparisons.
+                inner_max_probe = max(inner_max_probe, len(table))
+                inner_total_probe += len(table) * (len(table) + 1) // 2
+            else:
+                probes = table.probe_stats()
+                inner_max_probe = max(inner_max_probe, probes["max"])
+                inner_total_probe += probes["mean"] * len(table)
+                inner_rehashes += table.rehash_count
+                inner_rehash_time += table.rehash_time
+
+        return {
+            "size": self.table_size,
+            "count": len(self),
+            "entries": entries,
+            "load_factor": len(self) / self.table_size,
+            "max_probe": max_probe,
+            "mean_probe": total_probe / len(self) if len(self) else 0,
+            "rehashes": self.rehash_count,
+            "rehash_time": self.rehash_time,
+            "inner_load_factor": inner_load / len(self) if len(self) else 0,
+            "inner_max_probe": inner_max_probe,
+            "inner_mean_probe": inner_total_probe / entries if entries else 0,
+            "inner_rehashes": inner_rehashes,
+            "inner_rehash_time": inner_rehash_time,
+            "inner_sizes": inner_sizes,
+            "inline_tables": inline_tables,
+            "counters": None if self.counters is None else dict(self.counters),
+        }
+
+    def enable_counters(self) -> None:
+        """
+        Start counting top-level probes: "probes" is the number of top-level
+        key searches, "misses" how many of them did not find the key and
+        "probe_length" the total number of slots inspected by those that did.
+
+        Counting is switched on by shadowing _probe_top on this table only,
+        so tables without counters pay nothing for it.
+
+        :complexity: O(1)
+        """
+        self.counters = {"probes": 0, "misses": 0, "probe_length": 0}
+        probe_top = type(self)._probe_top
+
+        def counted_probe_top(key1: K1, is_insert: bool) -> int:
+            self.counters["probes"] += 1
+            try:
+                found = probe_top(self, key1, is_insert)
+            except KeyError:
+                self.counters["misses"] += 1
+                raise
+            self.counters["probe_length"] += (found - self.hash1(key1)) % self.table_size + 1
+            return found
+
+        self._probe_top = counted_probe_top
+
+    def disable_counters(self) -> None:
+        """
+        Stop counting probes and drop the counters.
+
+        :complexity: O(1)
+        """
+        self.__dict__.pop("_probe_top", None)
+        self.__dict__.pop("counters", None)
 
     @property
     def table_size(self) -> int:
@@ -308,50 +728,41 @@ class DoubleKeyTable(Generic[K1, K2, V]):
         result = "\n".join(f"({key}, {value})" for key, value in self.array if key is not None)
         return result
 
-    def __iter__(self):
-        return self
+    def __iter__(self) -> Iterator[K1]:
+        """
+        Iterates over the top-level keys. See iter_keys.
+        """
+        return self.iter_keys()
 
-    def __next__(self) -> K1 | V:
-        if self.iter_num == 0:
-            if self.curr_key is not None:
-                self.iter_num += 1
-                curr_ele = self.curr_key
-                self.curr_key = None
-                found_curr_key = False
-                for ele in self.array:
-                    if ele is not None:
-                        key, value = ele
-                        if found_curr_key:
-                            self.curr_key = key
-                            break
-                        if key == curr_ele:
-                            found_curr_key = True
-                return curr_ele
-            else:
-                raise StopIteration
 
-        else:
-            if self.curr_value is not None:
-                self.iter_num += 1
-                curr_ele = self.curr_value
-                self.curr_value = None
-                found_curr_value = False
-                ele_index = 0
-                while not found_curr_value and ele_index < len(self.array):
-                    if self.array[ele_index] is not None:
-                        for value2 in self.array[ele_index][1].values():
-                            if found_curr_value:
-                                self.curr_value = value2
-                                found_curr_value = False
-                            if value2 == curr_ele:
-                                found_curr_value = True
-                    ele_index += 1
-                if found_curr_value:
-                    return curr_ele
-                else:
-                    raise StopIteration
-            else:
-                raise StopIteration
+class DoubleKeyTableSnapshot(DoubleKeyTable[K1, K2, V]):
+    """
+    Read-only view of a DoubleKeyTable, see DoubleKeyTable.snapshot.
+
+    Supports every read of DoubleKeyTable. Anything that would change the
+    table raises TypeError.
+    """
+
+    def _read_only(self, *args, **kwargs) -> None:
+        raise TypeError("DoubleKeyTable snapshots are read-only")
+
+    __setitem__ = __delitem__ = set_many = compact = _read_only
+
+    def _probe_top(self, key1: K1, is_insert: bool) -> int:
+        """
+        See DoubleKeyTable._probe_top.
+
+        :raises TypeError: if is_insert is True.
+        """
+        if is_insert:
+            self._read_only()
+        return DoubleKeyTable._probe_top(self, key1, False)
+
+    def snapshot(self) -> DoubleKeyTableSnapshot[K1, K2, V]:
+        """
+        A snapshot never changes, so it is its own snapshot.
+        """
+        return self
 
 
 # from __future__ import annotations
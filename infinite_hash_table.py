@@ -92,17 +92,199 @@
 
 
 from __future__ import annotations
-from typing import Generic, TypeVar
+from heapq import merge
+from operator import itemgetter
+from typing import Generic, Iterable, Iterator, TypeVar, Union
 
 from data_structures.referential_array import ArrayR
+from data_structures.array_list import ArrayList
 
 K = TypeVar("K")
 V = TypeVar("V")
 
+
+class SmallNode:
+    """
+    Node of an InfiniteHashTable with at most CAPACITY children.
+
+    The indices of the children are kept sorted in a bytes object, and the
+    children in a tuple in the same order. Both are sized to the number of
+    children and rebuilt when it changes, which is cheap for so few, and
+    far smaller than an ArrayR (whose ctypes storage also keeps a
+    dictionary of the objects it holds).
+
+    Attributes:
+        level: position in the key that the node's children are indexed by.
+        skip: indices of the levels just above `level` that were compressed
+              into this node, because every key below it shares them.
+
+    Unless stated otherwise, all methods have O(CAPACITY) complexity.
+    """
+
+    __slots__ = ("level", "skip", "indices", "children")
+
+    CAPACITY = 4
+
+    def __init__(self, level: int, skip: tuple[int, ...], indices: bytes, children: tuple[Node, ...]) -> None:
+        """
+        :pre: indices is sorted, and has one entry per child.
+        """
+        self.level = level
+        self.skip = skip
+        self.indices = indices
+        self.children = children
+
+    @classmethod
+    def pair(cls, level: int, skip: tuple[int, ...], index_a: int, a: Node, index_b: int, b: Node) -> SmallNode:
+        """
+        A node with the two children a and b.
+
+        :pre: index_a != index_b
+        """
+        if index_b < index_a:
+            index_a, a, index_b, b = index_b, b, index_a, a
+        return cls(level, skip, bytes((index_a, index_b)), (a, b))
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def child(self, index: int) -> Node | None:
+        """
+        Returns the child at index, or None if there is none.
+        """
+        position = self.indices.find(index)
+        return None if position < 0 else self.children[position]
+
+    def set_child(self, index: int, child: Node) -> None:
+        """
+        Sets the child at index.
+
+        :pre: the node has a child at index, or fewer than CAPACITY children.
+        """
+        position = self.indices.find(index)
+        if position >= 0:
+            self.children = self.children[:position] + (child,) + self.children[position + 1:]
+            return
+        position = 0
+        while position < len(self.indices) and self.indices[position] < index:
+            position += 1
+        self.indices = self.indices[:position] + bytes((index,)) + self.indices[position:]
+        self.children = self.children[:position] + (child,) + self.children[position:]
+
+    def remove_child(self, index: int) -> None:
+        """
+        Removes the child at index.
+
+        :pre: the node has a child at index.
+        """
+        position = self.indices.find(index)
+        self.indices = self.indices[:position] + self.indices[position + 1:]
+        self.children = self.children[:position] + self.children[position + 1:]
+
+    def iter_children(self) -> Iterator[tuple[int, Node]]:
+        """
+        Yields every (index, child) pair, in index order.
+        """
+        return zip(self.indices, self.children)
+
+
+class DenseNode:
+    """
+    Node of an InfiniteHashTable with one slot per index.
+
+    See SmallNode for the attributes.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    __slots__ = ("level", "skip", "array", "count")
+
+    def __init__(self, level: int, skip: tuple[int, ...] = ()) -> None:
+        self.level = level
+        self.skip = skip
+        self.array: ArrayR[Node] = ArrayR(InfiniteHashTable.TABLE_SIZE)
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def child(self, index: int) -> Node | None:
+        """
+        Returns the child at index, or None if there is none.
+        """
+        return self.array[index]
+
+    def set_child(self, index: int, child: Node) -> None:
+        """
+        Sets the child at index.
+        """
+        if self.array[index] is None:
+            self.count += 1
+        self.array[index] = child
+
+    def remove_child(self, index: int) -> None:
+        """
+        Removes the child at index.
+
+        :pre: the node has a child at index.
+        """
+        self.array.release(index)
+        self.count -= 1
+
+    def to_small(self) -> SmallNode:
+        """
+        A SmallNode with the same level, skip and children.
+
+        :complexity: O(TABLE_SIZE)
+        :pre: 0 < len(self) <= SmallNode.CAPACITY
+        """
+        indices, children = zip(*self.iter_children())
+        return SmallNode(self.level, self.skip, bytes(indices), children)
+
+    def reset(self, level: int, skip: tuple[int, ...]) -> None:
+        """
+        Empties the node and moves it to the given level, for reuse.
+
+        :complexity: O(TABLE_SIZE), done in C.
+        """
+        self.array.clear()
+        self.count = 0
+        self.level = level
+        self.skip = skip
+
+    def iter_children(self) -> Iterator[tuple[int, Node]]:
+        """
+        Yields every (index, child) pair, in index order.
+
+        :complexity: O(TABLE_SIZE)
+        """
+        for index, child in enumerate(self.array):
+            if child is not None:
+                yield index, child
+
+
+# A child is either a node or a (key, value) leaf.
+Node = Union[SmallNode, DenseNode, tuple]
+
+
 class InfiniteHashTable(Generic[K, V]):
     """
     Infinite Hash Table.
 
+    A trie of hash tables: at level L a key is sent to the slot given by its
+    L-th character (see hash), and two keys that share a slot are split into
+    a table at the next level. get_location gives the slots on the way to a key.
+
+    Tables are stored compactly, without changing any location:
+        - a table with a few entries is a SmallNode sized to them, and only
+          one with more than SmallNode.CAPACITY is a full DenseNode,
+        - a chain of tables that each hold a single sub-table is stored as
+          one node, with the chain's slots kept in its `skip` indices.
+    The top-level table is always a DenseNode. A DenseNode goes back to
+    being a SmallNode once it is down to half of SmallNode.CAPACITY entries,
+    so alternating inserts and deletes do not convert back and forth, and
+    up to POOL_SIZE unused DenseNodes are kept for reuse.
+
     Type Arguments:
         - K:    Key Type. In most cases should be string.
                 Otherwise `hash` should be overwritten.
@@ -113,174 +295,419 @@ class InfiniteHashTable(Generic[K, V]):
 
     TABLE_SIZE = 27
 
+    # Most unused DenseNodes kept for reuse.
+    POOL_SIZE = 32
+
     def __init__(self) -> None:
-        self.level = 0
-        self.table = ArrayR(self.TABLE_SIZE)
-        self.size = 0
+        self.root = DenseNode(0)
+        self.count = 0
+        self.pool: ArrayList[DenseNode] = ArrayList()
 
-def hash(self, key: K) -> int:
-    """
-    Hashes a given key to an integer representing the index in the hash table.
-    
-    :param key: The key to hash.
-    :return: An integer representing the index in the hash table.
-    
-    If self.level < len(key), the hash function will use the character at the
-    index of self.level in the key to compute the hash. Otherwise, the hash
-    function returns self.TABLE_SIZE-1, indicating that the key should be
-    stored in a sub-hash table at index self.TABLE_SIZE-1.
-    
-    :complexity: O(1)
-    """
-    if self.level < len(key):
-        return ord(key[self.level]) % (self.TABLE_SIZE-1)
-    return self.TABLE_SIZE-1
+    def _new_dense(self, level: int, skip: tuple[int, ...]) -> DenseNode:
+        """
+        An empty DenseNode, taken from the pool when there is one.
 
+        :complexity: O(1) from the pool, O(TABLE_SIZE) otherwise.
+        """
+        if self.pool.is_empty():
+            return DenseNode(level, skip)
+        node = self.pool.pop()
+        node.level, node.skip = level, skip
+        return node
 
-def __getitem__(self, key: K) -> V:
-    """
-    Returns the value associated with the given key.
-    
-    :param key: The key associated with the value to retrieve.
-    :return: The value associated with the given key.
-    :raise KeyError: If the key is not found in the hash table.
-    
-    This function first calls the get_location method to get the location of the
-    key in the hash table. If the location is within the bounds of the current
-    table, the value at that location is returned. Otherwise, a KeyError is raised.
-    
-    :complexity: O(1)
-    """
-    loc = self.get_location(key)
-    if loc[-1] < self.TABLE_SIZE - 1:
-        return self.table[loc[-2]][loc[-1]]
-    raise KeyError
+    def _release(self, node: DenseNode) -> None:
+        """
+        Empties a DenseNode that is no longer in the table, and keeps it for
+        reuse unless the pool is full.
 
+        :complexity: O(TABLE_SIZE), done in C.
+        """
+        if len(self.pool) < self.POOL_SIZE:
+            node.reset(0, ())
+            self.pool.append(node)
 
-def __setitem__(self, key: K, value: V) -> None:
-    """
-    Sets the value associated with the given key in the hash table to the given value.
-    
-    :param key: The key to associate with the value.
-    :param value: The value to associate with the key.
-    
-    This function first calls the get_location method to get the location of the
-    key in the hash table. If the location is within the bounds of the current
-    table, the value at that location is set to the given value. Otherwise, a new
-    sub-hash table is created and the key and value are added to the new table.
-    
-    :complexity: O(1) on average, but can be O(n) in the worst case if a large number
-    of keys hash to the same location, causing a chain of sub-hash tables to be created.
-    """
-    loc = self.get_location(key)
-    if loc[-1] < self.TABLE_SIZE - 1:
-        self.table[loc[-2]][loc[-1]] = value
-    else:
-        new_table = InfiniteHashTable()
-        new_table.level = self.level + 1
-        new_table.__setitem__(key, value)
-        self.table[self.TABLE_SIZE-1] = new_table
-    self.size += 1
+    def hash(self, key: K, level: int) -> int:
+        """
+        Slot of key in a table at the given level: from the level-th
+        character of the key, or the last slot once the key is used up.
 
-    def __delitem__(self, key: K) -> None:
-        """Delete an item from the hash table by key.
-        
-        Args:
-        - key: The key of the item to delete.
-        
-        Raises:
-        - KeyError: If the key is not found in the hash table.
-        
-        Complexity:
-        - Time: O(log n), where n is the number of items in the hash table.
-            This is because the `get_location` method has time complexity O(log n),
-            and deleting an item from a list has time complexity O(n),
-            where n is the length of the list.
-        - Space: O(log n) because of the call stack used by the `get_location` method.
-        """
-        loc = self.get_location(key)
-        if loc[-1] == self.TABLE_SIZE - 1:
-            raise KeyError
-
-        del self.table[loc[-2]][loc[-1]]
-        self.size -= 1
-
-        while len(self.table) == 1 and isinstance(self.table[0], InfiniteHashTable):
-            new_root = self.table[0]
-            self.level = new_root.level
-            self.table = new_root.table
-
-    def __len__(self):
-        """Return the number of items in the hash table.
-        
-        Complexity:
-        - Time: O(1), because the `size` attribute is maintained with every insert and delete operation.
-        - Space: O(1).
-        """
-        return self.size
+        :complexity: O(1)
+        """
+        if level < len(key):
+            return ord(key[level]) % (self.TABLE_SIZE - 1)
+        return self.TABLE_SIZE - 1
 
-    def __str__(self) -> str:
-        """Return a string representation of the hash table.
-        
-        Complexity:
-        - Time: O(n), where n is the number of items in the hash table.
-            This is because the `list` constructor has time complexity O(n),
-            and the `join` method has time complexity O(n).
-        - Space: O(n), where n is the number of items in the hash table.
-            This is because the `join` method creates a new string object with length O(n),
-            and the `list` constructor creates a new list object with length O(n).
-        """
-        return str(list(self))
-
-    def get_location(self, key):
-        """Return the location of the given key in the hash table.
-        
-        Args:
-        - key: The key to look up.
-        
-        Returns:
-        - A list of integers representing the location of the key in the hash table.
-        
-        Complexity:
-        - Time: O(log n), where n is the number of items in the hash table.
-            This is because the `hash` method has time complexity O(1),
-            and the loop in this method iterates at most log(n) times.
-        - Space: O(log n), because the location list has length at most log(n).
-        """
-        current_table = self
+    def _skip_mismatch(self, key: K, node: SmallNode | DenseNode) -> int | None:
+        """
+        Returns the first offset into node.skip that key does not follow, or
+        None if key follows the whole compressed chain.
+
+        :complexity: O(len(node.skip))
+        """
+        base = node.level - len(node.skip)
+        for offset, index in enumerate(node.skip):
+            if self.hash(key, base + offset) != index:
+                return offset
+        return None
+
+    def _find(self, key: K) -> tuple[K, V] | None:
+        """
+        Returns the (key, value) leaf of key, or None if key is not in the table.
+
+        This is the lookup used by every operation: it descends without
+        building a location or raising on a miss.
+
+        :complexity: O(D) where D is the depth of key.
+        """
+        node = self.root
+        while True:
+            if node.skip and self._skip_mismatch(key, node) is not None:
+                return None
+            child = node.child(self.hash(key, node.level))
+            if child is None or type(child) is tuple:
+                return child if child is not None and child[0] == key else None
+            node = child
+
+    def get_location(self, key: K) -> list[int]:
+        """
+        Get the sequence of positions required to access this key.
+
+        Only meant for inspecting the table: lookups do not go through it.
+
+        :complexity: O(D) where D is the depth of key.
+        :raises KeyError: when the key doesn't exist.
+        """
+        if self._find(key) is None:
+            raise KeyError(key)
         location = []
+        node = self.root
+        while type(node) is not tuple:
+            index = self.hash(key, node.level)
+            location.extend(node.skip)
+            location.append(index)
+            node = node.child(index)
+        return location
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Get the value at a certain key
+
+        :complexity: O(D) where D is the depth of key.
+        :raises KeyError: when the key doesn't exist.
+        """
+        leaf = self._find(key)
+        if leaf is None:
+            raise KeyError(key)
+        return leaf[1]
+
+    def __setitem__(self, key: K, value: V) -> None:
+        """
+        Set an (key, value) pair in our hash table.
+
+        :complexity: O(D + len(key)) where D is the depth of key.
+        :raises ValueError: when key and another key have the same slot at
+                            every level, so they cannot be told apart.
+        """
+        parent, parent_index = None, -1
+        node = self.root
+        while True:
+            offset = self._skip_mismatch(key, node) if node.skip else None
+            if offset is not None:
+                # key leaves the compressed chain: split it at that level.
+                level = node.level - len(node.skip) + offset
+                index = node.skip[offset]
+                split = SmallNode.pair(level, node.skip[:offset], index, node,
+                                       self.hash(key, level), (key, value))
+                node.skip = node.skip[offset + 1:]
+                parent.set_child(parent_index, split)
+                self.count += 1
+                return
+
+            index = self.hash(key, node.level)
+            child = node.child(index)
+            if child is None:
+                self.count += 1
+                if type(node) is SmallNode and len(node) == SmallNode.CAPACITY:
+                    dense = self._new_dense(node.level, node.skip)
+                    for old_index, old_child in node.iter_children():
+                        dense.set_child(old_index, old_child)
+                    node = dense
+                    parent.set_child(parent_index, node)
+                node.set_child(index, (key, value))
+                return
+            if type(child) is tuple:
+                if child[0] == key:
+                    node.set_child(index, (key, value))
+                else:
+                    node.set_child(index, self._branch(child, (key, value), node.level + 1))
+                    self.count += 1
+                return
+            parent, parent_index, node = node, index, child
+
+    def _branch(self, leaf_a: tuple[K, V], leaf_b: tuple[K, V], level: int) -> SmallNode:
+        """
+        A node at the first level from `level` on where the keys of the two
+        leaves have different slots, with the levels before it compressed.
+
+        :complexity: O(L) where L is the length of the common slot sequence.
+        :raises ValueError: when the keys have the same slot at every level.
+        """
+        key_a, key_b = leaf_a[0], leaf_b[0]
+        skip = []
         while True:
-            location.append(current_table.hash(key))
-            if location[-1] < current_table.TABLE_SIZE - 1:
+            index_a, index_b = self.hash(key_a, level), self.hash(key_b, level)
+            if index_a != index_b:
+                return SmallNode.pair(level, tuple(skip), index_a, leaf_a, index_b, leaf_b)
+            if level >= len(key_a) and level >= len(key_b):
+                raise ValueError(f"Keys {key_a!r} and {key_b!r} have the same location.")
+            skip.append(index_a)
+            level += 1
+
+    @classmethod
+    def from_sorted(cls, items: Iterable[tuple[K, V]]) -> InfiniteHashTable[K, V]:
+        """
+        Builds a table from (key, value) pairs sorted by key, such as the
+        items of another table. If a key is repeated, its last value is kept.
+
+        Gives the same tables and locations as inserting the pairs one by
+        one, but each node is created once, already at its final size and
+        level, instead of leaves being split and moved as keys arrive.
+
+        :complexity: O(N*D) for N pairs of depth at most D, counting only the
+                     levels at which a table branches, plus O(len(key)) for the
+                     compressed levels of each node (see _build).
+        :raises ValueError: when the keys are not sorted, or when two keys
+                            have the same slot at every level.
+        """
+        leaves = []
+        for key, value in items:
+            if leaves and key <= leaves[-1][0]:
+                if key < leaves[-1][0]:
+                    raise ValueError(f"Key {key!r} comes after {leaves[-1][0]!r}, keys must be sorted.")
+                leaves.pop()
+            leaves.append((key, value))
+        table = cls()
+        for index, group in table._partition(leaves, 0):
+            table.root.set_child(index, group[0] if len(group) == 1 else table._build(group, 1))
+        table.count = len(leaves)
+        return table
+
+    def _partition(self, leaves: list[tuple[K, V]], level: int) -> list[tuple[int, list[tuple[K, V]]]]:
+        """
+        Groups leaves by their slot at the given level, as (index, leaves)
+        pairs in index order. Each group keeps the order of leaves.
+
+        :complexity: O(N) for N leaves.
+        """
+        groups = {}
+        for leaf in leaves:
+            groups.setdefault(self.hash(leaf[0], level), []).append(leaf)
+        return sorted(groups.items())
+
+    def _build(self, leaves: list[tuple[K, V]], level: int) -> SmallNode | DenseNode:
+        """
+        The node holding two or more leaves that share every slot before
+        `level`, with the levels where they all share a slot compressed into it.
+
+        The leaves are sorted, so when the first and the last agree on every
+        character before `level` (they may not, since one slot can hold
+        different characters), every key shares the characters those two
+        share, and the levels they cover are compressed without hashing each key.
+
+        :complexity: O(N*B + L) for N leaves below L levels, B of which branch.
+        :raises ValueError: when two keys have the same slot at every level.
+        """
+        first, last = leaves[0][0], leaves[-1][0]
+        skip = []
+        if first[:level] == last[:level]:
+            while level < min(len(first), len(last)) and first[level] == last[level]:
+                skip.append(self.hash(first, level))
+                level += 1
+        while True:
+            groups = self._partition(leaves, level)
+            if len(groups) > 1:
                 break
-            current_table = current_table.table[current_table.TABLE_SIZE - 1]
-        return location
+            if groups[0][0] == self.TABLE_SIZE - 1:
+                raise ValueError(f"Keys {leaves[0][0]!r} and {leaves[1][0]!r} have the same location.")
+            skip.append(groups[0][0])
+            level += 1
+        children = [(index, group[0] if len(group) == 1 else self._build(group, level + 1))
+                    for index, group in groups]
+        if len(children) <= SmallNode.CAPACITY:
+            indices, nodes = zip(*children)
+            return SmallNode(level, tuple(skip), bytes(indices), nodes)
+        node = DenseNode(level, tuple(skip))
+        for index, child in children:
+            node.set_child(index, child)
+        return node
+
+    def __delitem__(self, key: K) -> None:
+        """
+        Deletes a (key, value) pair in our hash table.
 
-    def __iter__(self):
-        """Iterate over the items in the hash table.
-        
-        Complexity:
-        - Time: O(n), where n is the number of items in the hash table.
-            This is because the `yield` statement is executed once for each item in the hash table.
-        - Space: O(1).
-        """
-        for i in range(self.TABLE_SIZE - 1):
-            if i < len(self.table):
-                if isinstance(self.table[i], V):
-                    yield self.table[i]
-                elif isinstance(self.table[i], InfiniteHashTable):
-                    for value in self.table[i]:
-                        yield value
+        A table left with a single entry is collapsed into its parent slot,
+        and a table left with a single sub-table is compressed into it. Only
+        the table holding key and its parent are changed: since every other
+        table has at least two entries, nothing above can need collapsing.
+
+        :complexity: O(D) where D is the depth of key, plus O(TABLE_SIZE)
+                     when a DenseNode is emptied or turned into a SmallNode.
+        :raises KeyError: when the key doesn't exist.
+        """
+        parent, parent_index = None, -1
+        node = self.root
+        while True:
+            if node.skip and self._skip_mismatch(key, node) is not None:
+                raise KeyError(key)
+            index = self.hash(key, node.level)
+            child = node.child(index)
+            if child is None or type(child) is tuple:
+                break
+            parent, parent_index, node = node, index, child
+        if child is None or child[0] != key:
+            raise KeyError(key)
+
+        self.count -= 1
+        node.remove_child(index)
+        if node is self.root:
+            return
+        if len(node) == 1:
+            (only_index, only_child), = node.iter_children()
+            if type(only_child) is not tuple:
+                only_child.skip = node.skip + (only_index,) + only_child.skip
+            parent.set_child(parent_index, only_child)
+        elif type(node) is DenseNode and len(node) <= SmallNode.CAPACITY // 2:
+            parent.set_child(parent_index, node.to_small())
+        else:
+            return
+        if type(node) is DenseNode:
+            self._release(node)
+
+    def __len__(self) -> int:
+        """
+        Returns number of elements in the hash table
+        """
+        return self.count
+
+    def _iter_sorted(self, node: SmallNode | DenseNode) -> Iterator[tuple[K, V]]:
+        """
+        Yields every (key, value) leaf below node, in key order.
+
+        Slots are indexed by character code modulo 26, so slot order is not
+        character order, and one slot can hold keys with different characters
+        (such as "a" and "G"). The children are therefore merged by key
+        rather than walked in slot order.
+
+        Only the leaves are produced lazily, not the walk: merge takes the
+        first leaf of every child before yielding anything, so getting the
+        first leaf opens every node below node, and sorts the leaves held
+        directly by each of them. Later leaves come from that frontier.
+
+        :complexity: O(M*log(TABLE_SIZE)) before the first leaf, where M is
+                     the number of nodes below node, then O(D*log(TABLE_SIZE))
+                     per leaf where D is its depth below node.
+        """
+        leaves, subtrees = [], []
+        for _, child in node.iter_children():
+            if type(child) is tuple:
+                leaves.append(child)
+            else:
+                subtrees.append(self._iter_sorted(child))
+        leaves.sort(key=itemgetter(0))
+        if subtrees:
+            yield from merge(leaves, *subtrees, key=itemgetter(0))
+        else:
+            yield from leaves
+
+    def iter_items(self) -> Iterator[tuple[K, V]]:
+        """
+        Yields every (key, value) pair, in key order. The first pair costs
+        a walk of every node in the table, see _iter_sorted.
+
+        :complexity: See _iter_sorted, for the whole table.
+        """
+        return self._iter_sorted(self.root)
+
+    def iter_keys(self) -> Iterator[K]:
+        """
+        Yields every key, in key order, see iter_items.
+
+        :complexity: See _iter_sorted, for the whole table.
+        """
+        return (key for key, _ in self.iter_items())
+
+    def iter_values(self) -> Iterator[V]:
+        """
+        Yields every value, in the key order of their keys, see iter_items.
+
+        :complexity: See _iter_sorted, for the whole table.
+        """
+        return (value for _, value in self.iter_items())
+
+    def __iter__(self) -> Iterator[K]:
+        """
+        Iterates over the keys, in key order.
+        """
+        return self.iter_keys()
+
+    def sort_keys(self) -> list[K]:
+        """
+        Returns all keys in the table, in key order.
+
+        :complexity: O(N*D*log(TABLE_SIZE)) for N keys of depth at most D.
+        """
+        return list(self.iter_keys())
+
+    def keys_with_prefix(self, prefix: K) -> Iterator[K]:
+        """
+        Yields every key starting with prefix, in key order.
+
+        Only the node that the prefix leads to is walked: O(len(prefix)) to
+        find it, then the cost of iterating over it (see _iter_sorted). The
+        first key already costs a walk of every node below that node, which
+        is proportional to the number of results unless the prefix shares
+        its slots with keys that do not start with it.
+
+        :complexity: O(len(prefix) + M*log(TABLE_SIZE)) for the first key, where
+                     M is the number of nodes below the prefix's node, then
+                     O(D*log(TABLE_SIZE)) per key of depth at most D.
+        """
+        node = self.root
+        while node.level < len(prefix):
+            base = node.level - len(node.skip)
+            for offset, index in enumerate(node.skip):
+                if self.hash(prefix, base + offset) != index:
+                    return
+            child = node.child(self.hash(prefix, node.level))
+            if child is None:
+                return
+            if type(child) is tuple:
+                if child[0][:len(prefix)] == prefix:
+                    yield child[0]
+                return
+            node = child
+        # Levels compressed into node beyond the prefix are not constrained by it.
+        base = node.level - len(node.skip)
+        for offset, index in enumerate(node.skip[:max(0, len(prefix) - base)]):
+            if self.hash(prefix, base + offset) != index:
+                return
+        for key, _ in self._iter_sorted(node):
+            if key[:len(prefix)] == prefix:
+                yield key
 
     def __contains__(self, key: K) -> bool:
         """
         Checks to see if the given key is in the Hash Table
 
-        :complexity: O(n) for n keys stored in the table.
+        :complexity: O(D) where D is the depth of key.
         """
-        try:
-            _ = self[key]
-        except KeyError:
-            return False
-        else:
-            return True
+        return self._find(key) is not None
+
+    def __str__(self) -> str:
+        """
+        Returns all they key/value pairs in our hash table, in location order.
+        """
+        result = ""
+        for key, value in self.iter_items():
+            result += "(" + str(key) + "," + str(value) + ")\n"
+        return result
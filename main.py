@@ -392,23 +392,23 @@ class MyWindow(arcade.Window):
         groups = self.mountain_manager.group_by_difficulty()
         to = MountainOrganiser()
         positions = DoubleKeyTable()
-        positions.hash1 = lambda k: (k % positions.table_size)
         all_mountains = []
+        all_keys = []
         for i, group in enumerate(groups):
             to.add_mountains(group)
-            for mountain in group:
-                positions[mountain.difficulty_level, mountain.name] = []
+            positions.set_many(((mountain.difficulty_level, mountain.name), []) for mountain in group)
             all_mountains.extend(group)
-            for mountain in all_mountains:
-                positions[mountain.difficulty_level, mountain.name].append(to.cur_position(mountain))
+            all_keys.extend((mountain.difficulty_level, mountain.name) for mountain in group)
+            for mountain, trail in zip(all_mountains, positions.get_many(all_keys)):
+                trail.append(to.cur_position(mountain))
         self.graph_data = [
             [
                 get_col(i, len(all_mountains)),
-                len(groups) - len(positions[mountain.difficulty_level, mountain.name]),
+                len(groups) - len(trail),
                 mountain.name,
-                positions[mountain.difficulty_level, mountain.name]
+                trail
             ]
-            for i, mountain in enumerate(all_mountains)
+            for i, (mountain, trail) in enumerate(zip(all_mountains, positions.get_many(all_keys)))
         ]
 
     def on_save_file_clicked(self):
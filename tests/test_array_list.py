@@ -0,0 +1,79 @@
+import unittest
+import weakref
+from ed_utils.decorators import number
+
+from data_structures.array_list import ArrayList
+
+class TestArrayList(unittest.TestCase):
+
+    @number("9.3")
+    def test_append_insert_pop(self):
+        lst = ArrayList()
+        for i in range(10):
+            lst.append(i)
+        self.assertEqual(list(lst), list(range(10)))
+        self.assertEqual(lst.capacity, 16)
+
+        lst.insert(0, "first")
+        lst.insert(5, "middle")
+        lst.insert(100, "last")
+        self.assertEqual(lst[0], "first")
+        self.assertEqual(lst[5], "middle")
+        self.assertEqual(lst[-1], "last")
+        self.assertEqual(len(lst), 13)
+
+        self.assertEqual(lst.pop(), "last")
+        self.assertEqual(lst.pop(0), "first")
+        lst.remove("middle")
+        self.assertEqual(list(lst), list(range(10)))
+        self.assertRaises(IndexError, lambda: lst[10])
+        self.assertRaises(ValueError, lambda: lst.remove("middle"))
+
+        # Shrinks once a quarter full.
+        while len(lst) > 2:
+            lst.pop()
+        self.assertEqual(lst.capacity, 4)
+        self.assertEqual(list(lst), [0, 1])
+
+    @number("9.4")
+    def test_reserve(self):
+        lst = ArrayList(range(3))
+        lst.reserve(100)
+        self.assertEqual(lst.capacity, 100)
+        self.assertEqual(list(lst), [0, 1, 2])
+        lst.reserve(10)
+        self.assertEqual(lst.capacity, 100)
+        # The reserved room survives removals...
+        lst.pop()
+        lst.pop(0)
+        self.assertEqual(lst.capacity, 100)
+        for i in range(100):
+            lst.append(i)
+        while len(lst) > 0:
+            lst.pop()
+        self.assertEqual(lst.capacity, 100)
+        # ...until the list is cleared.
+        lst.clear()
+        self.assertEqual(lst.capacity, ArrayList.MIN_CAPACITY)
+
+    @number("9.6")
+    def test_removed_items_released(self):
+        class Item:
+            pass
+        items = [Item() for _ in range(8)]
+        refs = [weakref.ref(item) for item in items]
+        lst = ArrayList(items, capacity=16)
+        lst[3] = None
+        del items
+        # Overwritten, popped from the end and from the middle, past a None.
+        self.assertIsNone(refs[3]())
+        lst.pop()
+        self.assertIsNone(refs[7]())
+        lst.pop(2)
+        self.assertIsNone(refs[2]())
+        lst.insert(0, None)
+        lst.pop(1)
+        self.assertIsNone(refs[0]())
+        self.assertEqual(lst.capacity, 16)
+        self.assertEqual([item() for item in refs if item() is not None], [lst[1], lst[3], lst[4], lst[5]])
+        self.assertEqual((lst[0], lst[2]), (None, None))
@@ -1,7 +1,12 @@
+import sys
+import threading
 import unittest
+import weakref
 from ed_utils.decorators import number
 
-from double_key_table import DoubleKeyTable
+from double_key_table import DoubleKeyTable, BottomTable, DoubleKeyTableSnapshot
+from concurrent_double_key_table import ConcurrentDoubleKeyTable
+from data_structures.small_table import SmallTable
 
 class TestDoubleHash(unittest.TestCase):
 
@@ -122,4 +127,358 @@ class TestDoubleHash(unittest.TestCase):
         # We just want to make sure you aren't returning a list and are doing this
         # with an iterator.
         self.assertRaises(BaseException, lambda: next(key_iterator))
-        self.assertRaises(BaseException, lambda: next(value_iterator))
\ No newline at end of file
+        self.assertRaises(BaseException, lambda: next(value_iterator))
+
+    @number("3.6")
+    def test_numeric_keys(self):
+        dt = DoubleKeyTable()
+        for level in range(-5, 40):
+            dt[level, f"mountain{level}"] = level
+            dt[level, (level, level + 1)] = -level
+        self.assertEqual(dt[7, "mountain7"], 7)
+        self.assertEqual(dt[-3, (-3, -2)], 3)
+        self.assertEqual(set(dt.keys()), set(range(-5, 40)))
+        self.assertEqual(set(dt.keys(12)), {"mountain12", (12, 13)})
+        self.assertNotIn((7, "mountain8"), dt)
+        self.assertRaises(TypeError, lambda: dt[7.5, "mountain7"])
+
+    @number("3.7")
+    def test_independent_iters(self):
+        dt = DoubleKeyTable()
+        expected = {}
+        for i in range(30):
+            for j in range(i % 4 + 1):
+                dt[f"top{i}", f"bottom{j}"] = i * 10 + j
+                expected[f"top{i}", f"bottom{j}"] = i * 10 + j
+
+        # Two iterations over the same table do not interfere with each other.
+        first, second = dt.iter_keys(), dt.iter_keys()
+        next(first)
+        self.assertEqual(len(list(second)), 30)
+        self.assertEqual(len(list(first)), 29)
+
+        self.assertEqual(dict(dt.iter_items()), expected)
+        self.assertEqual(sorted(dt.iter_values()), sorted(expected.values()))
+        self.assertEqual(set(dt.iter_keys("top3")), {"bottom0", "bottom1", "bottom2", "bottom3"})
+        self.assertEqual(set(dt.iter_values("top3")), {30, 31, 32, 33})
+        self.assertEqual(list(dt.iter_keys("missing")), [])
+
+    @number("3.8")
+    def test_sub_table(self):
+        # Disable resizing / rehashing.
+        dt = DoubleKeyTable(sizes=[12], internal_sizes=[5])
+        dt.hash1 = lambda k: ord(k[0]) % 12
+        dt.hash2 = lambda k, sub_table: ord(k[-1]) % 5
+
+        dt["May", "Ben"] = 3
+        dt["May", "Tom"] = 5
+        dt["Amy", "Ben"] = 2
+        # "May", "Amy" and "Mia" all hash to slot 5, so lookups probe rather than scan.
+        self.assertEqual(len(dt.sub_table("May")), 2)
+        self.assertEqual(dict(dt.sub_table("May").iter_items()), {"Ben": 3, "Tom": 5})
+        self.assertEqual(set(dt.keys("Amy")), {"Ben"})
+        self.assertEqual(set(dt.iter_values("May")), {3, 5})
+        self.assertRaises(KeyError, lambda: dt.sub_table("Mia"))
+        self.assertEqual(dt.values("Mia"), [])
+
+    @number("3.9")
+    def test_rehash_moves_tables(self):
+        dt = DoubleKeyTable()
+        for j in range(20):
+            dt["big", f"bottom{j}"] = j
+        big = dt.sub_table("big")
+        big_size = big.table_size
+        for i in range(50):
+            dt[f"top{i}", "bottom"] = i
+        self.assertGreater(dt.table_size, 5)
+        # The bottom-level table was moved as a whole, not rebuilt.
+        self.assertIs(dt.sub_table("big"), big)
+        self.assertEqual(big.table_size, big_size)
+        self.assertEqual(len(dt), 51)
+        self.assertEqual(dt["big", "bottom7"], 7)
+        self.assertEqual(dt["top42", "bottom"], 42)
+        # New entries still go through the moved table's hash.
+        dt["big", "bottom20"] = 20
+        self.assertEqual(len(big), 21)
+
+    @number("3.10")
+    def test_inline_groups(self):
+        dt = DoubleKeyTable()
+        for j in range(4):
+            dt["small", j] = j
+        small = dt.sub_table("small")
+        self.assertIsInstance(small, SmallTable)
+        self.assertEqual(dict(small.iter_items()), {0: 0, 1: 1, 2: 2, 3: 3})
+
+        # Overwriting an existing entry does not promote a full group.
+        dt["small", 3] = 30
+        self.assertIs(dt.sub_table("small"), small)
+
+        # One more entry than the threshold switches to a hashed table.
+        dt["small", 4] = 4
+        big = dt.sub_table("small")
+        self.assertIsInstance(big, BottomTable)
+        self.assertEqual(dict(big.iter_items()), {0: 0, 1: 1, 2: 2, 3: 30, 4: 4})
+        self.assertEqual(len(dt), 1)
+
+        del dt["small", 0]
+        self.assertNotIn(("small", 0), dt)
+        self.assertEqual(dt["small", 3], 30)
+
+        # Deleting from an inline group keeps the remaining entries.
+        dt["other", "a"] = 1
+        dt["other", "b"] = 2
+        dt["other", "c"] = 3
+        del dt["other", "a"]
+        self.assertEqual(set(dt.iter_items()), {(("other", "b"), 2), (("other", "c"), 3)} | {
+            (("small", j), v) for j, v in [(1, 1), (2, 2), (3, 30), (4, 4)]
+        })
+
+        # Bottom-level tables look up hash2 on the owner at call time.
+        dt.hash2 = lambda k, sub_table: 0
+        dt["small", 5] = 5
+        self.assertEqual(dt["small", 5], 5)
+        self.assertEqual(big.hash(5), 0)
+
+    @number("3.11")
+    def test_reverse_index(self):
+        dt = DoubleKeyTable(reverse_index=True)
+        for difficulty in range(1, 6):
+            for j in range(difficulty):
+                dt[difficulty, f"mountain{j}"] = difficulty * 10 + j
+
+        self.assertEqual(sorted(dt.keys_for_second("mountain3")), [4, 5])
+        self.assertEqual(sorted(dt.values_for_second("mountain3")), [43, 53])
+        self.assertEqual(
+            dict(zip(dt.keys_for_second("mountain0"), dt.values_for_second("mountain0"))),
+            {d: d * 10 for d in range(1, 6)},
+        )
+        self.assertEqual(dt.keys_for_second("missing"), [])
+
+        dt[4, "mountain3"] = 99
+        del dt[5, "mountain3"]
+        self.assertEqual(dt.keys_for_second("mountain3"), [4])
+        self.assertEqual(dt.values_for_second("mountain3"), [99])
+        del dt[4, "mountain3"]
+        self.assertEqual(dt.keys_for_second("mountain3"), [])
+
+        self.assertRaises(ValueError, lambda: DoubleKeyTable().keys_for_second("mountain0"))
+
+    @number("3.12")
+    def test_set_get_many(self):
+        dt = DoubleKeyTable(reverse_index=True)
+        items = [((d, f"mountain{j}"), d * 100 + j) for d in range(1, 8) for j in range(d * 3)]
+        dt.set_many(items)
+        self.assertEqual(len(dt), 7)
+        self.assertEqual(dt.get_many(key for key, _ in items), [value for _, value in items])
+        self.assertEqual(dt[7, "mountain20"], 720)
+        self.assertEqual(sorted(dt.keys_for_second("mountain5")), [2, 3, 4, 5, 6, 7])
+
+        # Overwrites, unsorted keys and groups that outgrow their inline table.
+        dt.set_many([((1, "mountain0"), -1), ((2, "new"), 5), ((1, "mountain0"), -2), ((1, "x"), 0), ((1, "y"), 0)])
+        self.assertEqual(dt.get_many([(1, "mountain0"), (2, "new"), (1, "y")]), [-2, 5, 0])
+        self.assertEqual(len(dt.sub_table(1)), 5)
+
+        self.assertRaises(KeyError, lambda: dt.get_many([(1, "mountain0"), (9, "mountain0")]))
+        self.assertEqual(dt.get_many([]), [])
+
+    @number("3.13")
+    def test_delete_keeps_clusters(self):
+        # Disable resizing / rehashing.
+        dt = DoubleKeyTable(sizes=[12], internal_sizes=[5])
+        dt.hash1 = lambda k: ord(k[0]) % 12
+        dt.hash2 = lambda k, sub_table: ord(k[-1]) % 5
+
+        # "Tim", "Het" and "Tom" share home slot 0, "Ann" lives at 5.
+        dt["Tim", "Jen"] = 1
+        dt["Het", "Bob"] = 2
+        dt["Tom", "Bob"] = 3
+        del dt["Tim", "Jen"]
+        # The cluster was shifted back instead of being cut at slot 0.
+        self.assertEqual(dt._linear_probe("Het", "Bob", False), (0, 3))
+        self.assertEqual(dt._linear_probe("Tom", "Bob", False), (1, 3))
+        self.assertEqual(dt["Tom", "Bob"], 3)
+        self.assertEqual(len(dt), 2)
+
+    @number("3.14")
+    def test_shrink_and_compact(self):
+        dt = DoubleKeyTable()
+        for i in range(1000):
+            for j in range(i % 10 + 1):
+                dt[f"top{i}", j] = i
+        grown = dt.table_size
+
+        # Churn: delete most keys, then check the rest are still reachable.
+        for i in range(1000):
+            if i % 50:
+                for j in range(i % 10 + 1):
+                    del dt[f"top{i}", j]
+        self.assertEqual(len(dt), 20)
+        self.assertLess(dt.table_size, grown)
+        for i in range(0, 1000, 50):
+            self.assertEqual(dt.values(f"top{i}"), [i])
+
+        for j in range(1, 10):
+            dt["top0", j] = 0
+        for j in range(1, 10):
+            del dt["top0", j]
+        # Emptied bottom-level tables shrink too, but stay hashed until compacted.
+        self.assertIsInstance(dt.sub_table("top0"), BottomTable)
+        self.assertEqual(dt.sub_table("top0").table_size, 5)
+        dt.compact()
+        self.assertIsInstance(dt.sub_table("top0"), SmallTable)
+        self.assertEqual(dt.values("top0"), [0])
+        self.assertEqual(dt.table_size, 53)
+
+    @number("3.15")
+    def test_stats(self):
+        dt = DoubleKeyTable()
+        for i in range(100):
+            for j in range(i % 8 + 1):
+                dt[i, j] = 0
+        stats = dt.stats()
+        self.assertEqual(stats["count"], 100)
+        self.assertEqual(stats["entries"], sum(i % 8 + 1 for i in range(100)))
+        self.assertEqual(stats["load_factor"], 100 / dt.table_size)
+        self.assertGreater(stats["rehashes"], 0)
+        self.assertEqual(stats["inner_sizes"], {n: 13 if n <= 4 else 12 for n in range(1, 9)})
+        self.assertEqual(stats["inline_tables"], 52)
+        self.assertGreaterEqual(stats["max_probe"], 1)
+        self.assertGreaterEqual(stats["inner_mean_probe"], 1)
+        self.assertIsNone(stats["counters"])
+
+        dt.enable_counters()
+        dt[3, 0], dt[4, 1]
+        self.assertNotIn((1000, 0), dt)
+        counters = dt.stats()["counters"]
+        self.assertEqual((counters["probes"], counters["misses"]), (3, 1))
+        self.assertGreaterEqual(counters["probe_length"], 2)
+        dt.disable_counters()
+        self.assertIsNone(dt.stats()["counters"])
+
+    @number("3.16")
+    def test_concurrent_stress(self):
+        dt = ConcurrentDoubleKeyTable(stripes=4)
+        errors = []
+
+        def worker(thread: int) -> None:
+            try:
+                for i in range(300):
+                    # Threads share top-level keys, and keep adding new ones.
+                    dt[i % 7, f"t{thread}-{i}"] = i
+                    dt[f"own{thread}-{i // 10}", i] = thread
+                    if i % 3 == 0:
+                        del dt[i % 7, f"t{thread}-{i}"]
+                    if i % 10 == 9:
+                        # Removes a whole top-level key.
+                        for j in range(i - 9, i + 1):
+                            del dt[f"own{thread}-{i // 10}", j]
+                    if i >= 1 and (i - 1) % 3:
+                        if dt[(i - 1) % 7, f"t{thread}-{i - 1}"] != i - 1:
+                            errors.append((thread, i))
+                    dt.keys()
+            except Exception as e:
+                errors.append(e)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=worker, args=(t,)) for t in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        self.assertEqual(errors, [])
+        expected = {
+            (i % 7, f"t{t}-{i}"): i for t in range(8) for i in range(300) if i % 3
+        }
+        self.assertEqual(dict(dt.items()), expected)
+        self.assertEqual(len(dt), 7)
+        self.assertEqual(dt.stats()["entries"], len(expected))
+
+    @number("3.17")
+    def test_snapshot(self):
+        dt = DoubleKeyTable(reverse_index=True)
+        for i in range(20):
+            for j in range(i % 8 + 1):
+                dt[i, j] = i * 10 + j
+        expected = dict(dt.iter_items())
+        view = dt.snapshot()
+        self.assertIsInstance(view, DoubleKeyTableSnapshot)
+        # Bottom-level tables are shared, not copied.
+        self.assertIs(view.sub_table(7), dt.sub_table(7))
+
+        dt[7, 0] = -1
+        dt[3, 100] = -1
+        del dt[0, 0]
+        dt[100, 0] = -1
+        for i in range(20, 200):
+            dt[i, 0] = i
+        # Only the touched tables were copied, the view still sees the old contents.
+        self.assertIsNot(view.sub_table(7), dt.sub_table(7))
+        self.assertIs(view.sub_table(8), dt.sub_table(8))
+        self.assertEqual(dict(view.iter_items()), expected)
+        self.assertEqual(view[7, 0], 70)
+        self.assertEqual(dt[7, 0], -1)
+        self.assertNotIn((100, 0), view)
+        self.assertEqual(len(view), 20)
+        self.assertEqual(sorted(view.keys_for_second(7)), [7, 15])
+        self.assertEqual(dt.keys_for_second(100), [3])
+
+        def write():
+            view[1, 1] = 0
+        self.assertRaises(TypeError, write)
+        self.assertRaises(TypeError, lambda: view.set_many([((1, 1), 0)]))
+        self.assertRaises(TypeError, lambda: view._linear_probe(500, 0, True))
+        self.assertIs(view.snapshot(), view)
+
+    @number("3.18")
+    def test_remove_top_releases_entries(self):
+        class Value:
+            pass
+        dt = DoubleKeyTable()
+        refs = {}
+        for i in range(30):
+            value = Value()
+            dt[f"top{i}", "bottom"] = value
+            refs[i] = weakref.ref(value)
+        del value
+        # Removing the last entry of a top-level key shifts its cluster back.
+        for i in range(0, 30, 4):
+            del dt[f"top{i}", "bottom"]
+        for i, ref in refs.items():
+            if i % 4 == 0:
+                self.assertIsNone(ref())
+            else:
+                self.assertIs(ref(), dt[f"top{i}", "bottom"])
+
+    @number("3.19")
+    def test_small_table_releases_entries(self):
+        class Value:
+            pass
+        table = SmallTable(4)
+        values = [Value() for _ in range(4)]
+        refs = [weakref.ref(value) for value in values]
+        for i, value in enumerate(values):
+            table[i] = value
+        del values, value
+        del table[1]
+        del table[3]
+        self.assertIsNone(refs[1]())
+        self.assertIsNone(refs[3]())
+        self.assertEqual(table.values(), [refs[0](), refs[2]()])
+
+    @number("3.20")
+    def test_concurrent_bulk_and_reverse(self):
+        self.assertRaises(ValueError, lambda: ConcurrentDoubleKeyTable(stripes=0))
+        dt = ConcurrentDoubleKeyTable(stripes=2, reverse_index=True)
+        dt.set_many(((i % 3, f"b{i}"), i) for i in range(12))
+        self.assertEqual(dt.get_many([(0, "b3"), (2, "b11"), (1, "b1")]), [3, 11, 1])
+        self.assertRaises(KeyError, lambda: dt.get_many([(0, "b1")]))
+        dt[5, "b3"] = 30
+        self.assertEqual(sorted(dt.keys_for_second("b3")), [0, 5])
+        self.assertEqual(sorted(dt.values_for_second("b3")), [3, 30])
+        self.assertRaises(ValueError, lambda: ConcurrentDoubleKeyTable().keys_for_second("b3"))
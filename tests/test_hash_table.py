@@ -0,0 +1,251 @@
+import unittest
+import weakref
+from ed_utils.decorators import number
+
+from data_structures.hash_table import LinearProbeTable, stays_put
+from data_structures.robin_hood_table import RobinHoodTable
+from data_structures.split_hash_table import SplitLinearProbeTable
+from data_structures.growth_policy import GrowthPolicy
+from double_key_table import DoubleKeyTable
+
+class TestLinearProbeTable(unittest.TestCase):
+
+    @number("8.1")
+    def test_from_items(self):
+        items = [(f"key{i}", i) for i in range(100)]
+        table = LinearProbeTable.from_items(items)
+        # Presized straight to the final size: smallest prime with 100 <= size / 2.
+        self.assertEqual(table.table_size, 389)
+        self.assertEqual(len(table), 100)
+        for key, value in items:
+            self.assertEqual(table[key], value)
+
+        table.update((f"key{i}", -i) for i in range(50, 150))
+        self.assertEqual(len(table), 150)
+        self.assertEqual(table["key10"], 10)
+        self.assertEqual(table["key60"], -60)
+        self.assertEqual(table["key149"], -149)
+
+    @number("8.2")
+    def test_delete_churn(self):
+        table = LinearProbeTable(sizes=[13])
+        # Force one long cluster: every key hashes to slot 3, except "x" which hashes to 4.
+        table.hash = lambda k: 4 if k == "x" else 3
+        for key in ["a", "b", "x", "c"]:
+            table[key] = key.upper()
+        self.assertEqual([table._linear_probe(k, False) for k in ["a", "b", "x", "c"]], [3, 4, 5, 6])
+
+        del table["a"]
+        # "b" and "c" shift back towards their home, "x" may not move before its home.
+        self.assertEqual([table._linear_probe(k, False) for k in ["b", "x", "c"]], [3, 4, 5])
+        del table["x"]
+        self.assertEqual([table._linear_probe(k, False) for k in ["b", "c"]], [3, 4])
+        self.assertRaises(KeyError, lambda: table["x"])
+        self.assertEqual(len(table), 2)
+
+    @number("8.3")
+    def test_shrink(self):
+        table = LinearProbeTable(shrink_threshold=0.125)
+        for i in range(200):
+            table[f"key{i}"] = i
+        self.assertEqual(table.table_size, 769)
+        for i in range(190):
+            del table[f"key{i}"]
+        self.assertEqual(len(table), 10)
+        self.assertLessEqual(table.table_size, 97)
+        self.assertEqual(set(table.values()), set(range(190, 200)))
+        for i in range(190, 200):
+            self.assertEqual(table[f"key{i}"], i)
+
+    @number("8.4")
+    def test_robin_hood(self):
+        table = RobinHoodTable(sizes=[13])
+        homes = {"a": 3, "b": 3, "c": 4, "d": 3, "z": 3}
+        table.hash = lambda k: homes[k]
+        for key in ["a", "b", "c", "d"]:
+            table[key] = key.upper()
+        # "d" is further from home than "c", so it takes c's slot.
+        self.assertEqual([table._linear_probe(k, False) for k in ["a", "b", "d", "c"]], [3, 4, 5, 6])
+        self.assertEqual(table.probe_stats(), {"max": 3, "mean": 2.25, "histogram": [0, 1, 1, 2]})
+        # A miss homed at 3 stops at "c" (distance 2 < 3) instead of reaching the empty slot.
+        self.assertRaises(KeyError, lambda: table._linear_probe("z", False))
+
+        del table["a"]
+        self.assertEqual([table._linear_probe(k, False) for k in ["b", "d", "c"]], [3, 4, 5])
+        self.assertEqual(table["c"], "C")
+
+    @number("8.5")
+    def test_robin_hood_load(self):
+        table = RobinHoodTable()
+        for i in range(1000):
+            table[f"key{i}"] = i
+        # Runs fuller than a LinearProbeTable would.
+        self.assertEqual(table.table_size, 1543)
+        for i in range(0, 1000, 2):
+            del table[f"key{i}"]
+        self.assertEqual(len(table), 500)
+        self.assertEqual(sorted(table.values()), list(range(1, 1000, 2)))
+        self.assertNotIn("key0", table)
+
+    @number("8.6")
+    def test_growth_policy(self):
+        # Explicit sizes without a policy: growth stops at the last size.
+        table = LinearProbeTable(sizes=[5, 13])
+        for i in range(10):
+            table[f"key{i}"] = i
+        self.assertEqual(table.table_size, 13)
+
+        # Generated primes past the end of the list.
+        table = LinearProbeTable(sizes=[5, 13], policy=GrowthPolicy(max_load_factor=0.75, growth_factor=3))
+        for i in range(100):
+            table[f"key{i}"] = i
+        self.assertEqual(table.table_size, 383)
+        self.assertEqual(sorted(table.values()), list(range(100)))
+
+        dt = DoubleKeyTable(sizes=[5], policy=GrowthPolicy(), internal_sizes=[5], internal_policy=GrowthPolicy(0.9))
+        for i in range(20):
+            dt[f"top{i}", "a"] = i
+            dt["top0", f"bottom{i}"] = i
+        self.assertEqual(dt.table_size, 47)
+        self.assertEqual(len(dt.keys()), 20)
+        self.assertEqual(len(dt.keys("top0")), 21)
+
+    @number("8.7")
+    def test_split_layout(self):
+        table = SplitLinearProbeTable(shrink_threshold=0.125)
+        for i in range(300):
+            table[f"key{i}"] = i
+        table["key7"] = "seven"
+        self.assertEqual(len(table), 300)
+        self.assertEqual(table["key7"], "seven")
+        # No (key, value) tuples are stored.
+        self.assertIn("key7", list(table.array))
+        for i in range(290):
+            del table[f"key{i}"]
+        self.assertEqual(sorted(table.keys()), sorted(f"key{i}" for i in range(290, 300)))
+        self.assertEqual(sorted(table.values()), list(range(290, 300)))
+        self.assertEqual(table.table_size, 53)
+        self.assertNotIn("key7", table)
+
+    @number("8.8")
+    def test_iterators(self):
+        for table in [LinearProbeTable(), SplitLinearProbeTable(), RobinHoodTable()]:
+            for i in range(2):
+                table[f"key{i}"] = i
+            self.assertEqual(set(table), {"key0", "key1"})
+            self.assertEqual(set(table.iter_values()), {0, 1})
+            self.assertEqual(set(table.iter_items()), {("key0", 0), ("key1", 1)})
+
+            # Updating values in place is fine, resizing is not.
+            keys = table.iter_keys()
+            key = next(keys)
+            table[key] = 10
+            for i in range(2, 10):
+                table[f"key{i}"] = i
+            self.assertRaises(RuntimeError, lambda: list(keys))
+
+    @number("8.9")
+    def test_stats(self):
+        for table_type in [LinearProbeTable, RobinHoodTable, SplitLinearProbeTable]:
+            table = table_type(sizes=[13, 29])
+            homes = {"a": 3, "b": 3, "c": 4, "z": 3}
+            table.hash = lambda k: homes[k]
+            for key in ["a", "b", "c"]:
+                table[key] = key
+            stats = table.stats()
+            self.assertEqual(stats["size"], 13)
+            self.assertEqual(stats["count"], 3)
+            self.assertAlmostEqual(stats["load_factor"], 3 / 13)
+            self.assertEqual(stats["max_probe"], 2)
+            self.assertEqual(stats["rehashes"], 0)
+            self.assertIsNone(stats["counters"])
+
+            table.enable_counters()
+            table["a"], table["b"]
+            self.assertNotIn("z", table)
+            self.assertEqual(table.stats()["counters"]["probes"], 3)
+            self.assertEqual(table.stats()["counters"]["misses"], 1)
+            self.assertEqual(table.stats()["counters"]["probe_length"], 3)
+            table.disable_counters()
+            table["a"]
+            self.assertIsNone(table.stats()["counters"])
+
+        table = LinearProbeTable()
+        for i in range(100):
+            table[i] = i
+        # 5, 13, 29, 53, 97, 193, 389.
+        self.assertEqual(table.stats()["rehashes"], 6)
+        self.assertGreater(table.stats()["rehash_time"], 0)
+        # Counters are per table.
+        self.assertIsNone(LinearProbeTable().counters)
+
+    @number("8.10")
+    def test_copy(self):
+        for table_type in [LinearProbeTable, RobinHoodTable, SplitLinearProbeTable]:
+            table = table_type()
+            for i in range(10):
+                table[f"key{i}"] = i
+            table.enable_counters()
+            copied = table.copy()
+            copied["key0"] = -1
+            del copied["key1"]
+            copied["new"] = 10
+            self.assertEqual(table["key0"], 0)
+            self.assertIn("key1", table)
+            self.assertNotIn("new", table)
+            self.assertEqual(len(table), 10)
+            self.assertEqual(sorted(copied.values()), [-1] + list(range(2, 11)))
+            self.assertIsNone(copied.counters)
+
+    @number("8.11")
+    def test_delete_releases_entries(self):
+        class Value:
+            pass
+        for table_type in [LinearProbeTable, RobinHoodTable, SplitLinearProbeTable]:
+            table = table_type()
+            values = {f"key{i}": Value() for i in range(40)}
+            for key, value in values.items():
+                table[key] = value
+            refs = {key: weakref.ref(value) for key, value in values.items()}
+            del values, value
+            # Deleting from the middle of clusters shifts the later entries back.
+            for i in range(0, 40, 3):
+                del table[f"key{i}"]
+            for key, ref in refs.items():
+                if key in table:
+                    self.assertIs(ref(), table[key])
+                else:
+                    self.assertIsNone(ref())
+
+    @number("8.12")
+    def test_stays_put(self):
+        # Cluster without wrapping: gap 2, item at 5.
+        self.assertTrue(stays_put(3, 2, 5))
+        self.assertTrue(stays_put(5, 2, 5))
+        self.assertFalse(stays_put(2, 2, 5))
+        self.assertFalse(stays_put(0, 2, 5))
+        self.assertFalse(stays_put(7, 2, 5))
+        # Cluster wrapping around the end: gap 11, item at 1.
+        self.assertTrue(stays_put(12, 11, 1))
+        self.assertTrue(stays_put(0, 11, 1))
+        self.assertTrue(stays_put(1, 11, 1))
+        self.assertFalse(stays_put(11, 11, 1))
+        self.assertFalse(stays_put(5, 11, 1))
+
+    @number("8.16")
+    def test_high_load_factor(self):
+        self.assertRaises(ValueError, lambda: GrowthPolicy(1.0))
+        self.assertRaises(ValueError, lambda: GrowthPolicy(0))
+        # Even nearly full tables grow instead of raising FullError.
+        for table_type in [LinearProbeTable, RobinHoodTable, SplitLinearProbeTable]:
+            table = table_type(policy=GrowthPolicy(0.99))
+            for i in range(200):
+                table[f"key{i}"] = i
+            self.assertEqual(sorted(table.values()), list(range(200)))
+            self.assertGreaterEqual(table.table_size, 200)
+        dt = DoubleKeyTable(policy=GrowthPolicy(0.99), internal_policy=GrowthPolicy(0.99))
+        for i in range(200):
+            dt[f"top{i}", "a"] = i
+            dt["top0", f"bottom{i}"] = i
+        self.assertEqual(len(dt.keys()), 200)
+        self.assertEqual(len(dt.keys("top0")), 201)
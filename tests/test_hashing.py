@@ -0,0 +1,46 @@
+import unittest
+from ed_utils.decorators import number
+
+from data_structures.hash_table import LinearProbeTable
+from data_structures.hashing import fingerprint, hash_key, _mix, FINGERPRINT_CACHE_SIZE, FINGERPRINT_MASK
+
+class TestHashing(unittest.TestCase):
+
+    @number("8.13")
+    def test_fingerprint_independent_of_size(self):
+        keys = ["Tim", "Jen", "Amy", "mountain-12345", ""]
+        for size in [5, 97, 1543]:
+            table = LinearProbeTable(sizes=[size])
+            for key in keys:
+                self.assertEqual(table.hash(key), fingerprint(key) % size)
+        # The same key gives the same fingerprint whatever tables it was used in.
+        self.assertEqual(fingerprint("Tim"), fingerprint("T" + "im"))
+        self.assertNotEqual(fingerprint("Tim"), fingerprint("Tin"))
+        self.assertEqual(hash_key("Tim"), fingerprint("Tim"))
+
+    @number("8.14")
+    def test_fingerprint_cache(self):
+        self.assertEqual(fingerprint.cache_info().maxsize, FINGERPRINT_CACHE_SIZE)
+        fingerprint.cache_clear()
+        first = fingerprint("Ben Nevis")
+        self.assertEqual(fingerprint.cache_info().misses, 1)
+        for _ in range(3):
+            self.assertEqual(fingerprint("Ben Nevis"), first)
+        info = fingerprint.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (3, 1, 1))
+
+    @number("8.15")
+    def test_mix_and_key_types(self):
+        mixed = [_mix(value) for value in range(1000)]
+        # splitmix64 is a bijection on 64-bit values, so no two inputs collide.
+        self.assertEqual(len(set(mixed)), 1000)
+        self.assertTrue(all(0 <= value <= FINGERPRINT_MASK for value in mixed))
+        # Consecutive inputs are spread, not left consecutive.
+        self.assertNotEqual(mixed[2] - mixed[1], 1)
+
+        self.assertEqual(hash_key(42), _mix(42))
+        self.assertEqual(hash_key(-1), _mix(FINGERPRINT_MASK))
+        self.assertEqual(hash_key(("Tim", 3)), hash_key(("Tim", 3)))
+        self.assertNotEqual(hash_key(("Tim", 3)), hash_key((3, "Tim")))
+        for key in [1.5, None, ["Tim"], b"Tim"]:
+            self.assertRaises(TypeError, lambda: hash_key(key))
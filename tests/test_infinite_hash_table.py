@@ -1,7 +1,8 @@
 import unittest
+import weakref
 from ed_utils.decorators import number
 
-from infinite_hash_table import InfiniteHashTable
+from infinite_hash_table import InfiniteHashTable, SmallNode, DenseNode
 
 class TestInfiniteHash(unittest.TestCase):
 
@@ -67,3 +68,129 @@ class TestInfiniteHash(unittest.TestCase):
         ih["lin"] = 10
         self.assertEqual(ih.get_location("lin"), [4])
         self.assertEqual(len(ih), 1)
+
+    @number("4.3")
+    def test_compact_nodes(self):
+        ih = InfiniteHashTable()
+        ih["lin"] = 1
+        ih["linked"] = 4
+        # The chain of single-child tables at [4, 1, 6] is one compressed node.
+        node = ih.root.child(4)
+        self.assertIsInstance(node, SmallNode)
+        self.assertEqual((node.level, node.skip), (3, (1, 6)))
+        self.assertEqual(ih.get_location("linked"), [4, 1, 6, 3])
+
+        # A key leaving the chain splits it without moving the others.
+        ih["limp"] = 5
+        self.assertEqual(ih.get_location("limp"), [4, 1, 5])
+        self.assertEqual(ih.get_location("lin"), [4, 1, 6, 26])
+
+        # Tables become dense past SmallNode.CAPACITY entries, and small again when emptied.
+        words = ["ant", "bee", "cat", "dog", "eel", "fox"]
+        for i, word in enumerate(words):
+            ih["q" + word] = i
+        self.assertIsInstance(ih.root.child(ord("q") % 26), DenseNode)
+        self.assertEqual(ih.get_location("qfox"), [ord("q") % 26, ord("f") % 26])
+        for word in words[:4]:
+            del ih["q" + word]
+        self.assertIsInstance(ih.root.child(ord("q") % 26), SmallNode)
+        self.assertEqual(ih["qeel"], 4)
+        del ih["qeel"]
+        self.assertEqual(ih.get_location("qfox"), [ord("q") % 26])
+
+        self.assertEqual(len(ih), 4)
+        self.assertEqual(set(ih), {"lin", "linked", "limp", "qfox"})
+        # Keys whose characters agree modulo 26 everywhere cannot be told apart.
+        ih["a"] = 1
+        self.assertRaises(ValueError, lambda: ih.__setitem__("G", 2))
+
+    @number("4.4")
+    def test_ordered_iteration(self):
+        ih = InfiniteHashTable()
+        keys = ["lin", "leg", "mine", "linked", "limp", "mining", "jake", "linger", "Gab", "aa", "zoo", "h"]
+        for i, key in enumerate(keys):
+            ih[key] = i
+        self.assertEqual(ih.sort_keys(), sorted(keys))
+        self.assertEqual(list(ih.iter_items()), sorted((key, i) for i, key in enumerate(keys)))
+        self.assertEqual(list(ih), sorted(keys))
+
+        self.assertEqual(list(ih.keys_with_prefix("lin")), ["lin", "linger", "linked"])
+        self.assertEqual(list(ih.keys_with_prefix("li")), ["limp", "lin", "linger", "linked"])
+        self.assertEqual(list(ih.keys_with_prefix("min")), ["mine", "mining"])
+        self.assertEqual(list(ih.keys_with_prefix("minx")), [])
+        self.assertEqual(list(ih.keys_with_prefix("j")), ["jake"])
+        self.assertEqual(list(ih.keys_with_prefix("")), sorted(keys))
+        # "G" and "a" share a slot, but only keys starting with the prefix are given.
+        self.assertEqual(list(ih.keys_with_prefix("a")), ["aa"])
+        self.assertEqual(list(ih.keys_with_prefix("G")), ["Gab"])
+
+        del ih["linger"]
+        self.assertEqual(list(ih.keys_with_prefix("lin")), ["lin", "linked"])
+
+    @number("4.5")
+    def test_node_pool(self):
+        class Value:
+            pass
+        ih = InfiniteHashTable()
+        words = ["ant", "bee", "cat", "dog", "eel", "fox"]
+        for word in words:
+            ih["q" + word] = Value()
+        dense = ih.root.child(ord("q") % 26)
+        self.assertIsInstance(dense, DenseNode)
+        for word in words[:4]:
+            del ih["q" + word]
+        # The emptied DenseNode is kept, cleared, and reused by the next table that needs one.
+        self.assertEqual(list(ih.pool), [dense])
+        self.assertEqual(len(dense), 0)
+        self.assertEqual(list(dense.iter_children()), [])
+        # The pooled node must not keep the leaves it held alive once they leave the table.
+        refs = [weakref.ref(ih["q" + word]) for word in words[4:]]
+        for word in words[4:]:
+            del ih["q" + word]
+        self.assertEqual([ref() for ref in refs], [None, None])
+        for word in words:
+            ih["x" + word] = 2
+        self.assertIs(ih.root.child(ord("x") % 26), dense)
+        self.assertTrue(ih.pool.is_empty())
+        self.assertEqual(ih.get_location("xdog"), [ord("x") % 26, ord("d") % 26])
+        self.assertEqual(len(ih), len(words))
+
+    @number("4.6")
+    def test_from_sorted(self):
+        keys = ["lin", "leg", "mine", "linked", "limp", "mining", "jake", "linger", "lin ", "linz", "mm"]
+        ih = InfiniteHashTable()
+        for i, key in enumerate(keys):
+            ih[key] = i
+        built = InfiniteHashTable.from_sorted(ih.iter_items())
+        self.assertEqual(len(built), len(ih))
+        self.assertEqual(built.sort_keys(), sorted(keys))
+        for i, key in enumerate(keys):
+            self.assertEqual(built[key], i)
+            self.assertEqual(built.get_location(key), ih.get_location(key))
+        # A repeated key keeps its last value.
+        built = InfiniteHashTable.from_sorted([("ant", 1), ("ant", 2), ("bee", 3)])
+        self.assertEqual(len(built), 2)
+        self.assertEqual(built["ant"], 2)
+        with self.assertRaises(ValueError):
+            InfiniteHashTable.from_sorted([("bee", 1), ("ant", 2)])
+        with self.assertRaises(ValueError):
+            InfiniteHashTable.from_sorted([("G", 1), ("a", 2)])
+
+    @number("4.7")
+    def test_delete_releases_leaves(self):
+        class Value:
+            pass
+        ih = InfiniteHashTable()
+        for word in ["ant", "bee", "cat", "dog", "eel", "fox", "gnu"]:
+            ih["q" + word] = Value()
+        ih["zebra"] = Value()
+        self.assertIsInstance(ih.root.child(ord("q") % 26), DenseNode)
+        # A leaf deleted from the root...
+        ref = weakref.ref(ih["zebra"])
+        del ih["zebra"]
+        self.assertIsNone(ref())
+        # ...and from an inner DenseNode that stays in the table.
+        ref = weakref.ref(ih["qcat"])
+        del ih["qcat"]
+        self.assertIsInstance(ih.root.child(ord("q") % 26), DenseNode)
+        self.assertIsNone(ref())
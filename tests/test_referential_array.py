@@ -0,0 +1,52 @@
+import unittest
+import weakref
+from ed_utils.decorators import number
+
+from data_structures.referential_array import ArrayR
+
+class TestArrayR(unittest.TestCase):
+
+    @number("9.1")
+    def test_init(self):
+        for length in [1, 5, 256, 257, 1000, 4097]:
+            array = ArrayR(length)
+            self.assertEqual(len(array), length)
+            self.assertEqual(list(array), [None] * length)
+        self.assertRaises(ValueError, lambda: ArrayR(0))
+
+    @number("9.2")
+    def test_bulk_operations(self):
+        array = ArrayR(10)
+        array.fill("x", 2, 5)
+        self.assertEqual(array[0:6], [None, None, "x", "x", "x", None])
+        array[6:8] = [1, 2]
+        self.assertEqual(array[6], 1)
+        self.assertEqual(array[7], 2)
+
+        other = ArrayR(20)
+        other.copy_from(array)
+        self.assertEqual(other[:10], array[:])
+        self.assertEqual(other[10:], [None] * 10)
+        other.fill(None)
+        other.copy_from(array, 3, 7)
+        self.assertEqual(other[:10], [None, None, None, "x", "x", None, 1, None, None, None])
+
+    @number("9.5")
+    def test_release(self):
+        class Item:
+            pass
+        array = ArrayR(20)
+        item = Item()
+        ref = weakref.ref(item)
+        array[12] = item
+        array[3] = "kept"
+        del item
+        # Storing None does not let go of the old object...
+        array[12] = None
+        self.assertIsNotNone(ref())
+        # ...but releasing the slot does.
+        array.release(12)
+        self.assertIsNone(ref())
+        self.assertEqual(array[12], None)
+        array.release(0)
+        self.assertEqual(array[3], "kept")